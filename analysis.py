@@ -7,18 +7,44 @@ at Axial Seamount for 2015-2026, computing daily average temperatures for all
 24 thermistor channels with channel characterization and publication-quality figures.
 
 Usage:
-    python analysis.py
+    python analysis.py [--workers N] [--incremental | --full-resolution] [--profile]
+                       [--reader {xarray,netcdf4}]
+    python analysis.py --watch [DIR] [--poll-seconds S]
+    python analysis.py --data-dir DIR --fetch URL [--max-connections N] [...]
+    python analysis.py --batch JOBS.json [--workers N] [--reader {xarray,netcdf4}]
 """
 
+import argparse
+import asyncio
+import cProfile
+import functools
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
 import re
-import xarray as xr
+import resource
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.dataset as pds
 from pathlib import Path
 
-# Matplotlib style settings for publication-quality figures
-plt.rcParams.update({
+# xarray, netCDF4, dask and matplotlib are imported by the stages that use
+# them, so importing this module to query outputs (or in a worker process)
+# does not pay for them; see benchmarks/startup_time.py
+
+# Matplotlib style settings for publication-quality figures, applied while
+# each figure is drawn (see figure_style())
+PLOT_STYLE = {
     'font.size': 10,
     'axes.labelsize': 11,
     'axes.titlesize': 12,
@@ -26,7 +52,7 @@ plt.rcParams.update({
     'ytick.labelsize': 10,
     'figure.dpi': 100,
     'savefig.dpi': 300,
-})
+}
 
 # Data paths
 DATA_DIR = Path('/home/jovyan/ooi/kdata/RS03ASHS-MJ03B-07-TMPSFA301-streamed-tmpsf_sample')
@@ -36,6 +62,33 @@ OUTPUT_DIR = Path(__file__).parent / 'outputs'
 DATA_OUTPUT_DIR = OUTPUT_DIR / 'data'
 FIGURES_DIR = OUTPUT_DIR / 'figures'
 
+# Content-addressed cache of per-file hourly aggregates for incremental runs,
+# capped in size with least-recently-used eviction
+CACHE_DIR = DATA_OUTPUT_DIR / 'cache'
+CACHE_MAX_BYTES = 2 * 2**30
+
+# Worker processes for figure rendering (1 = render serially in this process);
+# each worker imports pandas and matplotlib, so more than one only pays off
+# with a spare CPU per figure
+PLOT_WORKERS = min(3, os.cpu_count() or 1)
+
+# Machine-readable run report (per-stage and per-file metrics) and profile dump
+REPORT_PATH = OUTPUT_DIR / 'run_report.json'
+PROFILE_PATH = OUTPUT_DIR / 'run_profile.prof'
+
+# Year/month-partitioned Parquet store for fast range queries
+STORE_DIR = DATA_OUTPUT_DIR / 'store'
+STORE_ROW_GROUP_ROWS = {'hourly': 24 * 7, 'daily': 31}
+
+# Precomputed aggregate pyramid: level -> (resample rule, level it is built
+# from), finest first; hourly aggregates are the base level
+PYRAMID_DIR = DATA_OUTPUT_DIR / 'pyramid'
+PYRAMID_LEVELS = {'hour': ('h', None), 'day': ('D', 'hour'), 'week': ('W-MON', 'day'),
+                  'month': ('MS', 'day'), 'year': ('YS', 'month')}
+
+# Cached first/last timestamp of every NetCDF file, used for file selection
+CATALOG_PATH = DATA_OUTPUT_DIR / 'file_catalog.json'
+
 # Time range (extended to capture April 2015 eruption through present)
 TIME_START = '2015-01-01'
 TIME_END = '2026-01-25'
@@ -46,67 +99,423 @@ TEMP_VARS = [f'temperature{i:02d}' for i in range(1, 25)]
 # QARTOD QC variables (1=pass, 2=not evaluated, 3=suspect, 4=fail, 9=missing)
 QARTOD_VARS = [f'{v}_qartod_results' for v in TEMP_VARS]
 QARTOD_PASS = 1
+QARTOD_SUSPECT = 3
+QARTOD_FAIL = 4
 
 # Cross-channel consistency threshold (°C above median to flag as suspect)
 # Single-channel spikes exceeding this threshold above the median of other channels are flagged
 CONSISTENCY_THRESHOLD = 10.0
 
-# Regex pattern to extract year from filename
-YEAR_PATTERN = re.compile(r'(\d{4})\d{4}T')
+# Rows per chunk for the consistency check (bounds memory on sub-hourly data)
+CONSISTENCY_CHUNK_ROWS = 100_000
+
+# Candidate thresholds reported by the consistency threshold sweep (°C)
+CONSISTENCY_SWEEP_THRESHOLDS = [3.0, 5.0, 8.0, 10.0, 15.0, 20.0]
+
+# Run-length coverage index: hourly state of each channel, and the gap length
+# reported by report_coverage()
+COVERAGE_STATES = ['valid', 'no_data', 'qartod', 'consistency']
+COVERAGE_GAP_HOURS = 6
+
+COVERAGE_PATH = DATA_OUTPUT_DIR / 'coverage_index.parquet'
+
+# Change-point detection (detect_events): PELT penalty in units of
+# log(n_hours) noise variances, minimum segment length, and how many channels
+# must change within EVENT_WINDOW_HOURS of each other to form an event
+CHANGEPOINT_PENALTY = 40.0
+CHANGEPOINT_MIN_DAYS = 2
+EVENT_WINDOW_HOURS = 24
+EVENT_MIN_CHANNELS = 6
+
+# Mergeable per-hour statistics and how each is combined across chunks/bins:
+# value statistics of the samples kept, and counts of QARTOD-failed,
+# QARTOD-suspect and consistency-flagged samples
+AGG_MERGE = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max',
+             'n_qartod_fail': 'sum', 'n_qartod_suspect': 'sum', 'n_consistency': 'sum'}
+AGG_STATS = list(AGG_MERGE)
+AGG_FLAG_STATS = ['n_qartod_fail', 'n_qartod_suspect', 'n_consistency']
+
+# Bit-packed hourly QC provenance: one uint32 column per condition, bit j set
+# for channel j+1 (see build_qc_mask). QC_DEFAULT_REJECT gives the standard
+# QC'd data. QARTOD rejections are applied at sample level before hourly
+# aggregation, so the QARTOD bits can only reject more data, not restore it.
+QC_MASK_COLUMNS = ['qc_qartod_fail', 'qc_qartod_suspect', 'qc_consistency', 'qc_gap']
+QC_DEFAULT_REJECT = ['qc_consistency']
+
+# Samples per dask chunk in full-resolution mode, and dask worker threads
+# (chunks of all 24 channels are processed in parallel over time)
+FULL_RES_CHUNK_ROWS = 500_000
+FULL_RES_WORKERS = os.cpu_count() or 1
+
+# Number of worker processes for per-file ingestion (1 = serial)
+N_WORKERS = 1
+
+# How worker processes are started ('spawn' never forks a process that has
+# threads running, such as an executor's management thread)
+POOL_START_METHOD = 'spawn'
 
+# Per-file reader backend ('xarray' or 'netcdf4', see READERS) and the
+# netcdf4 reader's block size in samples (rounded down to whole chunks)
+READER = 'xarray'
+NC_READ_BLOCK_ROWS = 1_000_000
 
-def extract_years_from_filename(filename: str) -> set:
-    """Extract years covered by a NetCDF file from its filename.
+# Streaming mode: poll interval, persistent state and live channel statistics
+STREAM_POLL_SECONDS = 60
+STREAM_STATE_PATH = DATA_OUTPUT_DIR / 'stream_state.json'
+STREAM_STATS_PATH = DATA_OUTPUT_DIR / 'stream_channel_statistics.csv'
+
+# Per-stage and per-file metrics for the current run (written by main())
+RUN_REPORT = {'stages': [], 'files': []}
+
+# Peak RSS seen so far by each open measure_resources() block, outermost first
+_OPEN_PEAKS = []
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process since the last reset_peak_rss() (MB).
+
+    Falls back to the process-lifetime peak where /proc is unavailable.
+    """
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def reset_peak_rss() -> None:
+    """Reset the peak RSS reported by peak_rss_mb() to the current RSS (Linux)."""
+    try:
+        Path('/proc/self/clear_refs').write_text('5')
+    except OSError:
+        pass
+
+
+@contextmanager
+def measure_resources():
+    """Measure wall time, CPU time and peak RSS of the enclosed block.
+
+    Yields a dict that is filled in when the block exits. CPU time includes
+    worker processes that finished inside the block; peak RSS is that of
+    this process during the block (worker peaks are in the per-file
+    metrics). Blocks may nest: the peak is reset on entry, after saving it
+    for the enclosing blocks.
+    """
+    usage = {}
+    current = peak_rss_mb()
+    _OPEN_PEAKS[:] = [max(peak, current) for peak in _OPEN_PEAKS]
+    reset_peak_rss()
+    _OPEN_PEAKS.append(0.0)
+    t0, cpu0 = time.perf_counter(), os.times()
+    try:
+        yield usage
+    finally:
+        cpu1 = os.times()
+        usage['wall_s'] = time.perf_counter() - t0
+        usage['cpu_s'] = sum(cpu1[:4]) - sum(cpu0[:4])
+        usage['peak_rss_mb'] = max(_OPEN_PEAKS.pop(), peak_rss_mb())
+
+
+@contextmanager
+def run_stage(name: str, rows_in: int | None = None):
+    """Record one pipeline stage in RUN_REPORT.
+
+    Yields the stage record; set record['rows_out'] inside the block.
+    Sub-stages are named '<stage>: <step>' and excluded from the totals.
+    """
+    record = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+    with measure_resources() as usage:
+        yield record
+    record.update(usage)
+    RUN_REPORT['stages'].append(record)
+
+
+def write_run_report(path: Path) -> None:
+    """Write RUN_REPORT as JSON and print a per-stage timing table."""
+    files = RUN_REPORT['files']
+    RUN_REPORT['totals'] = {
+        'wall_s': sum(st['wall_s'] for st in RUN_REPORT['stages'] if ':' not in st['stage']),
+        'n_files': len(files),
+        'file_bytes': sum(f['file_bytes'] for f in files),
+        'file_read_s': sum(f['read_s'] for f in files),
+        'file_qc_resample_s': sum(f['qc_resample_s'] for f in files),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(RUN_REPORT, indent=1, default=str))
+
+    print('\nStage timings:')
+    for st in RUN_REPORT['stages']:
+        print(f'  {st["stage"]:<32} {st["wall_s"]:8.2f} s wall {st["cpu_s"]:8.2f} s CPU '
+              f'{st["peak_rss_mb"]:8.0f} MB peak RSS')
+    print(f'  Saved: {path.name}')
+
+
+def qc_aggregate_hourly(times: np.ndarray, temps: np.ndarray, qc: np.ndarray,
+                        columns: list[str]) -> tuple[pd.DataFrame, dict]:
+    """Apply QARTOD masks and reduce samples to hourly aggregates on raw arrays.
+
+    All channels are masked in one broadcast and QC counts come from one
+    reduction; only the small per-hour aggregate frame is materialized as a
+    DataFrame.
 
     Args:
-        filename: NetCDF filename containing date ranges
+        times: datetime64 sample times, shape (n_times,)
+        temps: Temperatures, shape (n_times, n_channels); column-major
+            (order='F') layout keeps the per-channel reductions contiguous
+        qc: QARTOD flags, same shape as temps
+        columns: Channel names for the columns of temps
 
     Returns:
-        Set of years covered by the file
+        Tuple of (hourly aggregates from accumulate_hourly(), QC counts per channel)
     """
-    matches = YEAR_PATTERN.findall(filename)
-    return set(int(y) for y in matches)
+    failed = qc != QARTOD_PASS
+    missing = np.isnan(temps)
+    n_total = len(temps) - missing.sum(axis=0)
+    n_failed = failed.sum(axis=0)
+    qc_counts = {
+        var: {'total': n_total[j], 'passed': n_total[j] - n_failed[j], 'failed': n_failed[j]}
+        for j, var in enumerate(columns)
+    }
+
+    values = temps.copy(order='F')
+    values[failed] = np.nan
+    flags = {'n_qartod_fail': qc == QARTOD_FAIL, 'n_qartod_suspect': qc == QARTOD_SUSPECT}
+    return accumulate_hourly(times, values, columns, flags), qc_counts
+
+
+def accumulate_hourly(times: np.ndarray, values: np.ndarray, columns: list[str],
+                      flags: dict[str, np.ndarray] | None = None) -> pd.DataFrame:
+    """Per-hour count, sum, sum of squares, min and max of each channel.
+
+    Samples are binned by integer hour index and reduced over contiguous runs
+    of samples in the same hour (OOI files are sorted by time; unsorted input
+    is sorted first). The statistics are mergeable: aggregates of different
+    blocks of data can be combined exactly with merge_aggregates(), and means,
+    variances and extremes derived from the combined accumulators.
 
+    Args:
+        times: datetime64 sample times, shape (n_times,)
+        values: Values, shape (n_times, n_channels), NaN for missing/masked
+        columns: Channel names for the columns of values
+        flags: Optional boolean arrays shaped like values, keyed by a name in
+            AGG_FLAG_STATS, counted per hour (statistics not given are zero)
 
-def load_data() -> tuple[pd.DataFrame, dict]:
-    """Load NetCDF files containing data within the time range.
+    Returns:
+        Aggregate DataFrame indexed by occupied hour ('time'), with
+        (statistic, channel) columns for each statistic in AGG_STATS
+    """
+    one_hour = np.timedelta64(1, 'h')
+    origin = times.min().astype('datetime64[h]').astype(times.dtype)
+    hour_idx = ((times - origin) // one_hour).astype(np.intp)
+
+    flags = flags or {}
+    if np.any(np.diff(hour_idx) < 0):
+        order = np.argsort(hour_idx, kind='stable')
+        hour_idx, values = hour_idx[order], values[order]
+        flags = {name: flag[order] for name, flag in flags.items()}
+    invalid = np.isnan(values)
+    filled = np.where(invalid, 0.0, values)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(hour_idx)) + 1))
+
+    # fmin/fmax ignore NaN, so hours without valid samples stay NaN
+    stats = {
+        'count': np.add.reduceat(~invalid, starts, axis=0, dtype=np.int64),
+        'sum': np.add.reduceat(filled, starts, axis=0, dtype=np.float64),
+        'sumsq': np.add.reduceat(np.square(filled, dtype=np.float64), starts, axis=0),
+        'min': np.fmin.reduceat(values, starts, axis=0).astype(np.float64),
+        'max': np.fmax.reduceat(values, starts, axis=0).astype(np.float64),
+    }
+    for name in AGG_FLAG_STATS:
+        stats[name] = (np.add.reduceat(flags[name], starts, axis=0, dtype=np.int64)
+                       if name in flags else np.zeros_like(stats['count']))
+    hours = origin + hour_idx[starts] * one_hour
+    return pd.concat({stat: pd.DataFrame(stats[stat], columns=columns)
+                      for stat in AGG_STATS}, axis=1).set_index(
+        pd.DatetimeIndex(hours, name='time'))
+
+
+def combine_aggregates(agg: pd.DataFrame, grouped) -> pd.DataFrame:
+    """Reduce grouped aggregate rows with each statistic's merge operation.
 
-    Uses regex-based year extraction for file filtering, QARTOD QC filtering,
-    and hourly resampling for memory-efficient loading of multi-year data.
+    Args:
+        agg: Aggregate DataFrame with (statistic, channel) columns
+        grouped: Callable mapping one statistic's sub-frame to a groupby or
+            resample object over the target bins
 
     Returns:
-        Tuple of (DataFrame with QC-filtered temperature data, QC statistics dict)
+        Aggregate DataFrame with one row per bin
     """
-    print('=' * 60)
-    print('ASHES TMPSF Temperature Analysis')
-    print(f'Time range: {TIME_START} to {TIME_END}')
-    print('=' * 60)
+    return pd.concat({stat: getattr(grouped(agg[stat]), op)()
+                      for stat, op in AGG_MERGE.items()}, axis=1)
 
-    print(f'\nData directory: {DATA_DIR}')
 
-    # Parse target year range
-    start_year = int(TIME_START[:4])
-    end_year = int(TIME_END[:4])
-    target_years = set(range(start_year, end_year + 1))
+def merge_aggregates(aggs: list[pd.DataFrame]) -> pd.DataFrame:
+    """Merge hourly aggregates from several chunks or files.
 
-    # Filter files by year using regex extraction
-    nc_files = sorted(DATA_DIR.glob('*.nc'))
-    files = []
-    for f in nc_files:
-        file_years = extract_years_from_filename(f.name)
-        if file_years & target_years:  # intersection
-            files.append(f)
+    Counts and sums are added and extremes combined hour by hour, so the
+    result does not depend on how the samples were split into chunks, which
+    process produced them, or the order they are merged in.
+    """
+    agg = pd.concat(aggs).sort_index(kind='stable')
+    if not agg.index.has_duplicates:
+        return agg
+    return combine_aggregates(agg, lambda frame: frame.groupby(level=0))
 
-    print(f'Found {len(files)} files containing {start_year}-{end_year} data')
 
-    dfs = []
-    qc_counts = {var: {'total': 0, 'passed': 0, 'failed': 0} for var in TEMP_VARS}
+def resample_aggregates(agg: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Merge hourly aggregates into coarser regular bins (e.g. 'D')."""
+    return combine_aggregates(agg, lambda frame: frame.resample(rule))
+
+
+def mask_aggregates(agg: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
+    """Drop the samples of flagged (hour, channel) cells from the aggregates.
+
+    Args:
+        agg: Hourly aggregate DataFrame
+        mask: Boolean DataFrame indexed by hour with channel columns, True
+            where the hour's data for that channel is rejected
+
+    Returns:
+        Copy of agg with zero count/sum/sumsq and NaN min/max in flagged
+        cells; flag counts are kept
+    """
+    agg = agg.copy()
+    columns = agg['count'].columns
+    flagged = mask.reindex(index=agg.index, columns=columns, fill_value=False).to_numpy(bool)
+    for stat, fill in (('count', 0), ('sum', 0), ('sumsq', 0), ('min', np.nan), ('max', np.nan)):
+        values = agg[stat].to_numpy(copy=True)
+        values[flagged] = fill
+        agg[stat] = values
+    return agg
+
+
+def aggregate_means(agg: pd.DataFrame) -> pd.DataFrame:
+    """Sample-weighted mean of each bin; NaN where a bin has no samples."""
+    counts = agg['count']
+    return (agg['sum'] / counts.where(counts > 0)).astype(np.float64)
+
+
+def hourly_means(agg: pd.DataFrame) -> pd.DataFrame:
+    """Dense hourly mean DataFrame from hourly aggregates.
+
+    Hours between the first and last occupied hour with no data are NaN,
+    matching resample('h').mean().
+    """
+    df = aggregate_means(agg).asfreq('h')
+    df.index.name = 'time'
+    return df
+
+
+def pack_channel_bits(flags: np.ndarray) -> np.ndarray:
+    """Pack a boolean (n_rows, n_channels <= 32) array into one uint32 per row.
+
+    Bit j of each row is set where channel j is flagged.
+    """
+    shifts = np.arange(flags.shape[1], dtype=np.uint32)
+    return np.bitwise_or.reduce(flags.astype(np.uint32) << shifts, axis=1).astype(np.uint32)
+
+
+def unpack_channel_bits(packed: np.ndarray, n_channels: int = len(TEMP_VARS)) -> np.ndarray:
+    """Inverse of pack_channel_bits(): boolean array of shape (n_rows, n_channels)."""
+    shifts = np.arange(n_channels, dtype=np.uint32)
+    return ((np.asarray(packed, dtype=np.uint32)[:, None] >> shifts) & 1).astype(bool)
+
+
+def build_qc_mask(agg: pd.DataFrame, index: pd.DatetimeIndex,
+                  consistency: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Bit-packed QC provenance of every channel for each hour in `index`.
+
+    One uint32 column per condition in QC_MASK_COLUMNS, bit j for TEMP_VARS[j]:
 
-    for i, f in enumerate(files):
-        if i % 10 == 0:
-            print(f'  Loading file {i+1}/{len(files)}...')
+    - qc_qartod_fail: the hour had samples with QARTOD flag 4
+    - qc_qartod_suspect: the hour had samples with QARTOD flag 3
+    - qc_consistency: the hourly value was removed by the consistency check
+    - qc_gap: no samples passed QARTOD in the hour
 
-        ds = xr.open_dataset(f)
+    Every sample not flagged QARTOD_PASS (including flags 2 and 9, which are
+    not recorded here) is dropped before the hourly aggregates are built, so
+    the QARTOD bits only say that an hour's value excludes such samples; the
+    excluded values themselves cannot be recovered from the mask.
+
+    Args:
+        agg: Hourly aggregates before the hourly consistency check
+        index: Hours to describe (the dense hourly index of the output)
+        consistency: Boolean DataFrame of hourly consistency flags; if None
+            (full-resolution mode), hours whose samples were all flagged
+            according to agg['n_consistency'] are marked instead
+
+    Returns:
+        DataFrame indexed like `index` with the QC_MASK_COLUMNS columns
+    """
+    dense = agg.reindex(index)
+    n_kept = dense['count'][TEMP_VARS].fillna(0).to_numpy()
+    n_flagged = dense['n_consistency'][TEMP_VARS].fillna(0).to_numpy()
+    if consistency is None:
+        consistency = (n_kept == 0) & (n_flagged > 0)
+    else:
+        consistency = consistency.reindex(index=index, columns=TEMP_VARS,
+                                          fill_value=False).to_numpy(bool)
+    bits = {
+        'qc_qartod_fail': dense['n_qartod_fail'][TEMP_VARS].fillna(0).to_numpy() > 0,
+        'qc_qartod_suspect': dense['n_qartod_suspect'][TEMP_VARS].fillna(0).to_numpy() > 0,
+        'qc_consistency': consistency,
+        'qc_gap': n_kept + n_flagged == 0,
+    }
+    return pd.DataFrame({name: pack_channel_bits(bits[name]) for name in QC_MASK_COLUMNS},
+                        index=index)
+
+
+def apply_qc_mask(values: pd.DataFrame, qc_mask: pd.DataFrame,
+                  reject: list[str] | None = None) -> pd.DataFrame:
+    """Rebuild a QC variant: NaN values whose channel bit is set in any `reject` column.
+
+    For example reject=[] gives QARTOD-only data (no consistency check),
+    QC_DEFAULT_REJECT the standard output, and adding 'qc_qartod_suspect'
+    also drops hours that contained suspect samples. Variants can only be
+    stricter than the QARTOD filtering applied at ingest; keeping suspect
+    samples needs a reload with a different QARTOD pass rule.
+
+    Args:
+        values: Hourly values with temperature channel columns
+        qc_mask: build_qc_mask() output aligned with values
+        reject: QC_MASK_COLUMNS to reject (defaults to QC_DEFAULT_REJECT)
+
+    Returns:
+        Copy of values with rejected channel values set to NaN
+    """
+    reject = QC_DEFAULT_REJECT if reject is None else reject
+    values = values.copy()
+    if not reject:
+        return values
+    packed = np.bitwise_or.reduce(qc_mask[reject].to_numpy(np.uint32), axis=1)
+    columns = [v for v in TEMP_VARS if v in values.columns]
+    rejected = unpack_channel_bits(packed)[:, [TEMP_VARS.index(v) for v in columns]]
+    values[columns] = values[columns].mask(rejected)
+    return values
+
+
+def read_file_xarray(path: Path, after: np.datetime64 | None = None,
+                     window: tuple | None = None) -> tuple | None:
+    """Read a file's samples in the time window with xarray.
+
+    Args:
+        path: Path to a TMPSF NetCDF file
+        after: Drop samples at or before this time (already read from an
+            earlier, overlapping file)
+        window: Inclusive (start, end) timestamps, either None for no bound
+            (defaults to time_window())
+
+    Returns:
+        Tuple of (datetime64 times, temperatures, QARTOD flags, per-channel
+        bool array of QARTOD variables present), arrays shaped (n_times, 24)
+        in column-major order; None if the file has no samples in the window
+    """
+    import xarray as xr
+
+    with xr.open_dataset(path) as ds:
         ds = ds.swap_dims({'obs': 'time'})
 
         # Get available temperature and QC variables
@@ -115,38 +524,930 @@ def load_data() -> tuple[pd.DataFrame, dict]:
 
         # Load both temp and QC data
         vars_to_load = available_temp + available_qc
-        ds_filt = ds[vars_to_load].sel(time=slice(TIME_START, TIME_END))
-
-        if ds_filt.sizes['time'] > 0:
-            df_chunk = ds_filt.to_dataframe()
-
-            # Apply QARTOD filtering: mask values where QC != 1 (pass)
-            for temp_var in available_temp:
-                qc_var = f'{temp_var}_qartod_results'
-                if qc_var in df_chunk.columns:
-                    n_total = df_chunk[temp_var].notna().sum()
-                    qc_mask = df_chunk[qc_var] != QARTOD_PASS
-                    n_failed = qc_mask.sum()
-
-                    # Set failed QC values to NaN
-                    df_chunk.loc[qc_mask, temp_var] = np.nan
-
-                    qc_counts[temp_var]['total'] += n_total
-                    qc_counts[temp_var]['failed'] += n_failed
-                    qc_counts[temp_var]['passed'] += (n_total - n_failed)
-
-            # Keep only temperature columns and resample to hourly
-            df_chunk = df_chunk[available_temp]
-            df_hourly = df_chunk.resample('h').mean()
-            dfs.append(df_hourly)
-        ds.close()
+        window_start, window_end = window or time_window()
+        ds_filt = ds[vars_to_load].sel(time=slice(window_start, window_end))
+        if after is not None:
+            ds_filt = ds_filt.isel(time=ds_filt['time'].values > after)
+
+        n_times = ds_filt.sizes['time']
+        if n_times == 0:
+            return None
+
+        # Read straight into column-major (n_times, 24) arrays so each channel
+        # is contiguous; missing channels stay NaN and missing QARTOD
+        # variables pass
+        temp_dtype = np.result_type(*(ds_filt[v].dtype for v in available_temp))
+        qc_dtype = np.result_type(np.int8, *(ds_filt[v].dtype for v in available_qc))
+        temps = np.full((n_times, len(TEMP_VARS)), np.nan, dtype=temp_dtype, order='F')
+        qc = np.full((n_times, len(TEMP_VARS)), QARTOD_PASS, dtype=qc_dtype, order='F')
+        for j, temp_var in enumerate(TEMP_VARS):
+            if temp_var in available_temp:
+                temps[:, j] = ds_filt[temp_var].values
+            if QARTOD_VARS[j] in available_qc:
+                qc[:, j] = ds_filt[QARTOD_VARS[j]].values
+        times = ds_filt['time'].values
+
+    has_qc = np.array([q in available_qc for q in QARTOD_VARS])
+    return times, temps, qc, has_qc
+
+
+def cf_time_units(units: str) -> tuple[int, np.datetime64]:
+    """Parse CF time units like 'seconds since 1900-01-01'.
+
+    Returns:
+        Tuple of (nanoseconds per unit, reference time as datetime64[ns])
+    """
+    unit, _, reference = units.partition(' since ')
+    ns_per_unit = pd.Timedelta(1, unit=unit.strip().lower()).value
+    return ns_per_unit, np.datetime64(pd.Timestamp(reference.strip()).tz_localize(None), 'ns')
+
+
+def cf_decoded_dtype(var) -> np.dtype:
+    """dtype of a netCDF4 variable after CF decoding (as xarray decodes it)."""
+    attrs = var.ncattrs()
+    if 'scale_factor' in attrs or 'add_offset' in attrs:
+        return np.dtype(np.float64)
+    if var.dtype.kind in 'iu' and ('_FillValue' in attrs or 'missing_value' in attrs):
+        return np.dtype(np.float64)
+    return var.dtype
+
+
+def cf_decode(var, values: np.ndarray) -> np.ndarray:
+    """Apply CF _FillValue/missing_value masking and scale/offset to raw values.
+
+    Mirrors xarray's default decoding; valid_range attributes are not applied.
+    """
+    attrs = var.ncattrs()
+    values = values.astype(cf_decoded_dtype(var), copy=False)
+    for attr in ('_FillValue', 'missing_value'):
+        if attr in attrs:
+            fill = np.atleast_1d(var.getncattr(attr))
+            if not np.all(np.isnan(fill.astype(np.float64))):
+                values = np.where(np.isin(values, fill), np.nan, values)
+    if 'scale_factor' in attrs:
+        values = values * var.getncattr('scale_factor')
+    if 'add_offset' in attrs:
+        values = values + var.getncattr('add_offset')
+    return values
+
+
+def chunk_aligned_blocks(lo: int, hi: int, var) -> list[tuple[int, int]]:
+    """Split rows [lo, hi) into read blocks aligned to the variable's chunks.
+
+    Blocks are the largest multiple of the chunk length not above
+    NC_READ_BLOCK_ROWS, so every HDF5 chunk is decompressed exactly once.
+    """
+    chunking = var.chunking()
+    chunk_rows = NC_READ_BLOCK_ROWS if chunking == 'contiguous' else chunking[0]
+    block_rows = max(chunk_rows, NC_READ_BLOCK_ROWS // chunk_rows * chunk_rows)
+    edges = np.arange((lo // block_rows + 1) * block_rows, hi, block_rows)
+    bounds = np.concatenate(([lo], edges, [hi]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def read_file_netcdf4(path: Path, after: np.datetime64 | None = None,
+                      window: tuple | None = None) -> tuple | None:
+    """Read a file's samples in the time window directly with netCDF4.
+
+    Same output as read_file_xarray(), without building a label index or
+    Dataset: the time window (and overlap cutoff) is located with a binary
+    search on the raw, sorted time values, and only the rows inside it are
+    read, block by block along chunk boundaries, into preallocated arrays.
+    """
+    import netCDF4
+
+    with netCDF4.Dataset(path) as nc:
+        nc.set_auto_maskandscale(False)
+        variables = nc.variables
+
+        time_var = variables['time']
+        raw_times = time_var[:]
+        ns_per_unit, reference = cf_time_units(time_var.getncattr('units'))
+
+        # Window bounds and cutoff in the file's raw time units
+        window_start, window_end = window or time_window()
+
+        def to_raw(t) -> float:
+            return (np.datetime64(t, 'ns') - reference).astype(np.int64) / ns_per_unit
+
+        if np.any(raw_times[1:] < raw_times[:-1]):
+            raise ValueError(f'{path.name}: time is not sorted; use the xarray reader')
+        lo = 0 if window_start is None else np.searchsorted(raw_times, to_raw(window_start), side='left')
+        if after is not None:
+            lo = max(lo, np.searchsorted(raw_times, to_raw(after), side='right'))
+        hi = len(raw_times) if window_end is None else np.searchsorted(raw_times, to_raw(window_end), side='right')
+        n_times = hi - lo
+        if n_times <= 0:
+            return None
+
+        whole = np.floor(raw_times[lo:hi])
+        offset_ns = (whole.astype(np.int64) * ns_per_unit
+                     + np.round((raw_times[lo:hi] - whole) * ns_per_unit).astype(np.int64))
+        times = reference + offset_ns.astype('timedelta64[ns]')
+
+        available_temp = [v for v in TEMP_VARS if v in variables]
+        available_qc = [v for v in QARTOD_VARS if v in variables]
+        temp_dtype = np.result_type(*(cf_decoded_dtype(variables[v]) for v in available_temp))
+        qc_dtype = np.result_type(np.int8, *(cf_decoded_dtype(variables[v]) for v in available_qc))
+        temps = np.full((n_times, len(TEMP_VARS)), np.nan, dtype=temp_dtype, order='F')
+        qc = np.full((n_times, len(TEMP_VARS)), QARTOD_PASS, dtype=qc_dtype, order='F')
+        for out, names in ((temps, TEMP_VARS), (qc, QARTOD_VARS)):
+            for j, name in enumerate(names):
+                if name not in variables:
+                    continue
+                var = variables[name]
+                for a, b in chunk_aligned_blocks(lo, hi, var):
+                    out[a - lo:b - lo, j] = cf_decode(var, var[a:b])
+
+    has_qc = np.array([q in available_qc for q in QARTOD_VARS])
+    return times, temps, qc, has_qc
+
+
+# Per-file reader backends, selected with READER / --reader
+READERS = {'xarray': read_file_xarray, 'netcdf4': read_file_netcdf4}
+
+
+def load_file(path: Path, after: np.datetime64 | None = None, metrics: dict | None = None,
+              reader: str | None = None, window: tuple | None = None) -> tuple[pd.DataFrame | None, dict]:
+    """Load, QARTOD-filter and hourly-aggregate a single NetCDF file.
+
+    Runs in a worker process when load_data() is called with n_workers > 1,
+    so it only returns the compact hourly aggregates and the file's QC counts.
+
+    Args:
+        path: Path to a TMPSF NetCDF file
+        after: Drop samples at or before this time (already read from an
+            earlier, overlapping file)
+        metrics: Optional dict to fill with read/QC timings and row counts
+        reader: Reader backend in READERS (defaults to READER)
+        window: Inclusive (start, end) time window (defaults to time_window())
+
+    Returns:
+        Tuple of (hourly aggregate DataFrame or None if no data in the time
+        range, QC statistics dict for this file)
+    """
+    qc_counts = {}
+    t_start = time.perf_counter()
+
+    arrays = READERS[reader or READER](path, after, window)
+    t_read = time.perf_counter()
+
+    agg = None
+    n_times = 0
+    if arrays is not None:
+        n_times = len(arrays[0])
+        agg, qc_counts = aggregate_file_arrays(*arrays)
+
+    if metrics is not None:
+        metrics.update({
+            'read_s': t_read - t_start,
+            'qc_resample_s': time.perf_counter() - t_read,
+            'rows_in': int(n_times),
+            'rows_out': 0 if agg is None else len(agg),
+        })
+    return agg, qc_counts
+
+
+def aggregate_file_arrays(times: np.ndarray, temps: np.ndarray, qc: np.ndarray,
+                          has_qc: np.ndarray) -> tuple[pd.DataFrame, dict]:
+    """QARTOD-filter and hourly-aggregate one file's arrays from a reader.
+
+    Channels without a QARTOD variable are treated as passing and get no QC
+    counts.
+    """
+    agg, counts = qc_aggregate_hourly(times, temps, qc, TEMP_VARS)
+    return agg, {var: counts[var] for var, checked in zip(TEMP_VARS, has_qc) if checked}
+
+
+def load_file_windows(path: Path, windows: list[tuple], reader: str | None = None) -> tuple[list, dict]:
+    """Read a file once and aggregate it separately for several time windows.
+
+    Used by run_batch() when jobs with different windows (or overlap cutoffs)
+    share a file: the union of the windows is read, then each window gets
+    exactly what load_file() would return for it.
+
+    Args:
+        path: Path to a TMPSF NetCDF file
+        windows: (start, end, after) per job, with start/end as in
+            time_window() and after as in load_file()
+        reader: Reader backend in READERS (defaults to READER)
+
+    Returns:
+        Tuple of (list of load_file()-style results in `windows` order,
+        per-file metrics dict)
+    """
+    bounds = [time_window(start, end) for start, end, _ in windows]
+    afters = [after for _, _, after in windows]
+    first = min(range(len(windows)), key=lambda k: bounds[k][0])
+    last = max(range(len(windows)), key=lambda k: bounds[k][1])
+    after = None if any(a is None for a in afters) else min(afters)
+
+    metrics = {'file': path.name, 'file_bytes': path.stat().st_size, 'n_jobs': len(windows)}
+    with measure_resources() as usage:
+        t_start = time.perf_counter()
+        arrays = READERS[reader or READER](path, after, (bounds[first][0], bounds[last][1]))
+        t_read = time.perf_counter()
+
+        results = []
+        for (start, end), window_after in zip(bounds, afters):
+            if arrays is None:
+                results.append((None, {}))
+                continue
+            times = arrays[0]
+            keep = (times >= np.datetime64(start)) & (times <= np.datetime64(end))
+            if window_after is not None:
+                keep &= times > window_after
+            if not keep.any():
+                results.append((None, {}))
+            elif keep.all():
+                results.append(aggregate_file_arrays(*arrays))
+            else:
+                results.append(aggregate_file_arrays(times[keep], np.asfortranarray(arrays[1][keep]),
+                                                     np.asfortranarray(arrays[2][keep]), arrays[3]))
+    metrics.update(usage, read_s=t_read - t_start, qc_resample_s=time.perf_counter() - t_read,
+                   rows_in=0 if arrays is None else len(arrays[0]),
+                   rows_out=sum(0 if agg is None else len(agg) for agg, _ in results))
+    return results, metrics
+
+
+def load_file_instrumented(path: Path, after: np.datetime64 | None = None,
+                           reader: str | None = None) -> tuple[tuple, dict]:
+    """Run load_file() and measure it, for the run report.
+
+    Returns:
+        Tuple of (load_file() result, per-file metrics dict)
+    """
+    metrics = {'file': path.name, 'file_bytes': path.stat().st_size}
+    with measure_resources() as usage:
+        result = load_file(path, after, metrics, reader)
+    metrics.update(usage)
+    return result, metrics
+
+
+def merge_qc_counts(qc_counts: dict, other: dict) -> None:
+    """Add per-channel QC counts from `other` into `qc_counts` in place."""
+    for var, counts in other.items():
+        for key in ('total', 'passed', 'failed'):
+            qc_counts[var][key] += counts[key]
+
+
+def ingest_files(files: list[Path], cutoffs: list[np.datetime64 | None],
+                 n_workers: int | None = None, reader: str | None = None) -> list[tuple]:
+    """Run load_file() over `files`, serially or in a process pool.
+
+    Args:
+        files: NetCDF files to ingest
+        cutoffs: Per-file `after` times from find_input_files()
+        n_workers: Number of worker processes (defaults to N_WORKERS; 1 = serial)
+        reader: Reader backend in READERS (defaults to READER)
+
+    Returns:
+        List of load_file() results in the same order as `files`
+    """
+    n_workers = n_workers if n_workers is not None else N_WORKERS
+    chunks = []
+
+    if n_workers > 1 and len(files) > 1:
+        # Workers return results in file order, so merging downstream sees
+        # exactly the same chunk sequence as the serial path.
+        print(f'Loading with {n_workers} worker processes')
+        with worker_pool(n_workers) as pool:
+            results = pool.map(load_file_instrumented, files, cutoffs, repeat(reader))
+            for i, (result, metrics) in enumerate(results):
+                if i % 10 == 0:
+                    print(f'  Loaded file {i+1}/{len(files)}...')
+                chunks.append(result)
+                RUN_REPORT['files'].append(metrics)
+    else:
+        for i, (f, after) in enumerate(zip(files, cutoffs)):
+            if i % 10 == 0:
+                print(f'  Loading file {i+1}/{len(files)}...')
+            result, metrics = load_file_instrumented(f, after, reader)
+            chunks.append(result)
+            RUN_REPORT['files'].append(metrics)
+
+    return chunks
+
+
+def file_identity(path: Path) -> dict:
+    """Identity of an input file for change detection (size and mtime)."""
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def ingest_functions() -> list:
+    """Module functions on the per-file ingest path, sorted by name.
+
+    Every module-level function referenced by name from load_file() or a
+    reader backend, transitively (including from nested functions).
+    """
+    def referenced(code) -> set[str]:
+        names = set(code.co_names)
+        for const in code.co_consts:
+            if inspect.iscode(const):
+                names |= referenced(const)
+        return names
+
+    module = globals()
+    found, pending = {}, [load_file, *READERS.values()]
+    while pending:
+        func = pending.pop()
+        if func.__name__ not in found:
+            found[func.__name__] = func
+            pending += [module[name] for name in referenced(func.__code__)
+                        if inspect.isfunction(module.get(name))]
+    return [found[name] for name in sorted(found)]
+
+
+def ingest_code_hash() -> str:
+    """Hash of the source of the per-file ingest code (see ingest_functions()).
+
+    Part of every cache key, so cached intermediates are invalidated when the
+    reading, QARTOD masking or hourly aggregation code changes.
+    """
+    source = ''.join(inspect.getsource(func) for func in ingest_functions())
+    return hashlib.sha256(source.encode()).hexdigest()
 
-    print('Concatenating data chunks...')
-    df = pd.concat(dfs).sort_index()
-    df = df[~df.index.duplicated(keep='first')]
 
-    print(f'Loaded {len(df):,} hourly observations')
-    return df, qc_counts
+def cache_key(path: Path, start: pd.Timestamp, end: pd.Timestamp,
+              after: np.datetime64 | None, code_hash: str, reader: str) -> str:
+    """Content address of one file's QC'd hourly aggregates.
+
+    Built from the file's identity (name, size, mtime), the part of the time
+    window the file covers, the overlap cutoff, the QARTOD flag values, the
+    aggregate statistics, the reader backend and the ingest code hash.
+    Changing the time window only changes the keys of files that straddle
+    its ends.
+
+    Args:
+        path: NetCDF file
+        start, end: The file's first and last timestamp (from the catalog)
+        after: Sample cutoff from file_cutoffs()
+        code_hash: ingest_code_hash() of the running code
+        reader: Reader backend name, so backends can be compared
+    """
+    window_start, window_end = time_window()
+    params = {
+        'file': path.name,
+        **file_identity(path),
+        'window': [str(max(start, window_start)), str(min(end, window_end))],
+        'after': None if after is None else str(after),
+        'qartod_pass': QARTOD_PASS,
+        'qartod_suspect': QARTOD_SUSPECT,
+        'qartod_fail': QARTOD_FAIL,
+        'aggregates': AGG_STATS,
+        'reader': reader,
+        'code': code_hash,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def load_cache_index() -> dict:
+    """Load the cache index (key -> entry), dropping entries whose data is gone."""
+    index_path = CACHE_DIR / 'index.json'
+    index = json.loads(index_path.read_text()) if index_path.exists() else {}
+    return {key: entry for key, entry in index.items()
+            if entry['cache'] is None or (CACHE_DIR / entry['cache']).exists()}
+
+
+def save_cache_index(index: dict, max_bytes: int | None = None) -> None:
+    """Evict least recently used entries above the size cap and write the index.
+
+    Args:
+        index: Cache index from load_cache_index()
+        max_bytes: Size cap for cached data (defaults to CACHE_MAX_BYTES)
+    """
+    max_bytes = max_bytes if max_bytes is not None else CACHE_MAX_BYTES
+    total = sum(entry['bytes'] for entry in index.values())
+    n_evicted = 0
+    for key in sorted(index, key=lambda k: index[k]['last_used']):
+        if total <= max_bytes:
+            break
+        entry = index.pop(key)
+        if entry['cache']:
+            (CACHE_DIR / entry['cache']).unlink(missing_ok=True)
+        total -= entry['bytes']
+        n_evicted += 1
+    if n_evicted:
+        print(f'  Cache: evicted {n_evicted} least recently used entries')
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    (CACHE_DIR / 'index.json').write_text(json.dumps(index, indent=1))
+
+
+def prune_cache_index(index: dict, nc_files: list[Path], code_hash: str) -> None:
+    """Drop cache entries that no current file can hit, and unreferenced data files.
+
+    An entry is orphaned when its source file is gone or changed (name,
+    size, mtime) or it was written by different ingest code.
+    """
+    current = {path.name: file_identity(path) for path in nc_files}
+    orphaned = [key for key, entry in index.items()
+                if current.get(entry['file']) != entry.get('identity')
+                or entry.get('code') != code_hash]
+    for key in orphaned:
+        entry = index.pop(key)
+        if entry['cache']:
+            (CACHE_DIR / entry['cache']).unlink(missing_ok=True)
+    referenced = {entry['cache'] for entry in index.values()}
+    stray = [f for f in CACHE_DIR.glob('*.parquet') if f.name not in referenced]
+    for f in stray:
+        f.unlink()
+    if orphaned or stray:
+        print(f'  Cache: pruned {len(orphaned)} orphaned entries, {len(stray)} unreferenced files')
+
+
+def cache_get(index: dict, key: str) -> tuple[pd.DataFrame | None, dict] | None:
+    """Return a cached (hourly aggregates, QC counts) result, or None on a miss."""
+    entry = index.get(key)
+    if entry is None:
+        return None
+    entry['last_used'] = time.time()
+    agg = pd.read_parquet(CACHE_DIR / entry['cache']) if entry['cache'] else None
+    return agg, entry['qc_counts']
+
+
+def cache_put(index: dict, key: str, path: Path, result: tuple, code_hash: str) -> None:
+    """Store one file's load_file() result in the cache under `key`."""
+    agg, qc_counts = result
+    cache = None
+    n_bytes = 0
+    if agg is not None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache = f'{key}.parquet'
+        agg.to_parquet(CACHE_DIR / cache)
+        n_bytes = (CACHE_DIR / cache).stat().st_size
+
+    index[key] = {
+        'file': path.name,
+        'identity': file_identity(path),
+        'code': code_hash,
+        'cache': cache,
+        'bytes': n_bytes,
+        'last_used': time.time(),
+        'qc_counts': {var: {k: int(v) for k, v in counts.items()}
+                      for var, counts in qc_counts.items()},
+    }
+
+
+def output_paths(output_dir: Path) -> dict:
+    """Module-level output paths for outputs written under `output_dir`."""
+    data_dir = output_dir / 'data'
+    return {
+        'OUTPUT_DIR': output_dir,
+        'DATA_OUTPUT_DIR': data_dir,
+        'FIGURES_DIR': output_dir / 'figures',
+        'CACHE_DIR': data_dir / 'cache',
+        'REPORT_PATH': output_dir / 'run_report.json',
+        'PROFILE_PATH': output_dir / 'run_profile.prof',
+        'STORE_DIR': data_dir / 'store',
+        'PYRAMID_DIR': data_dir / 'pyramid',
+        'CATALOG_PATH': data_dir / 'file_catalog.json',
+        'COVERAGE_PATH': data_dir / 'coverage_index.parquet',
+        'STREAM_STATE_PATH': data_dir / 'stream_state.json',
+        'STREAM_STATS_PATH': data_dir / 'stream_channel_statistics.csv',
+    }
+
+
+@contextmanager
+def pipeline_settings(data_dir: Path | str | None = None, start: str | None = None,
+                      end: str | None = None, output_dir: Path | str | None = None,
+                      consistency_threshold: float | None = None):
+    """Temporarily point DATA_DIR, the time range and the output paths elsewhere.
+
+    Settings that are None keep their current value; everything is restored
+    when the block exits.
+    """
+    settings = {}
+    if data_dir is not None:
+        settings['DATA_DIR'] = Path(data_dir)
+    if start is not None:
+        settings['TIME_START'] = start
+    if end is not None:
+        settings['TIME_END'] = end
+    if output_dir is not None:
+        settings.update(output_paths(Path(output_dir)))
+    if consistency_threshold is not None:
+        settings['CONSISTENCY_THRESHOLD'] = float(consistency_threshold)
+
+    module = globals()
+    saved = {name: module[name] for name in settings}
+    module.update(settings)
+    try:
+        yield
+    finally:
+        module.update(saved)
+
+
+def current_settings() -> dict:
+    """Snapshot of the module settings pipeline_settings() manages, plus PLOT_STYLE."""
+    names = ['DATA_DIR', 'TIME_START', 'TIME_END', 'CONSISTENCY_THRESHOLD', 'PLOT_STYLE',
+             *output_paths(OUTPUT_DIR)]
+    return {name: globals()[name] for name in names}
+
+
+def apply_settings(settings: dict) -> None:
+    """Install a current_settings() snapshot in this process (pool initializer)."""
+    globals().update(settings)
+
+
+def worker_pool(n_workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers run with the caller's current settings.
+
+    Workers are started with POOL_START_METHOD and do not inherit module
+    globals, so the current_settings() snapshot taken here is installed in
+    each of them before it runs any task.
+    """
+    return ProcessPoolExecutor(max_workers=n_workers,
+                               mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                               initializer=apply_settings, initargs=(current_settings(),))
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Settings for one pipeline run, for use as a library.
+
+    Fields mirror the pipeline_settings() arguments (and batch job keys);
+    None keeps the module default (DATA_DIR, TIME_START, TIME_END,
+    OUTPUT_DIR, CONSISTENCY_THRESHOLD). Stage and query functions read these
+    from module globals, so call them inside `with config.apply():`; worker
+    pools started there pass them on (see worker_pool()).
+
+    Example:
+        config = PipelineConfig(data_dir='/data/tmpsf', start='2015-01-01',
+                                end='2015-12-31', output_dir='/tmp/tmpsf_2015')
+        df, df_daily, df_stats = run_pipeline(config, n_workers=4)
+        with config.apply():
+            gaps = list_gaps(6)
+    """
+    data_dir: Path | str | None = None
+    start: str | None = None
+    end: str | None = None
+    output_dir: Path | str | None = None
+    consistency_threshold: float | None = None
+
+    def apply(self):
+        """Context manager that applies this configuration (see pipeline_settings())."""
+        return pipeline_settings(**asdict(self))
+
+    def describe(self) -> dict:
+        """The settings given explicitly, as strings (for run reports)."""
+        return {k: str(v) for k, v in asdict(self).items() if v is not None}
+
+
+def time_window(start: str | None = None,
+                end: str | None = None) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Return the inclusive (start, end) timestamps of a time range.
+
+    Matches label-slice semantics, so an end of '2026-01-25' covers that
+    whole day. Defaults to TIME_START..TIME_END.
+    """
+    start = TIME_START if start is None else start
+    end = TIME_END if end is None else end
+    return pd.Period(start).start_time, pd.Period(end).end_time
+
+
+def read_time_coverage(path: Path) -> tuple[str, str] | None:
+    """Read the first and last timestamp of a NetCDF file's `time` variable.
+
+    Returns:
+        Tuple of ISO timestamps, or None if the file has no time samples
+    """
+    import xarray as xr
+
+    with xr.open_dataset(path) as ds:
+        times = ds['time'].values
+    if times.size == 0:
+        return None
+    return pd.Timestamp(times.min()).isoformat(), pd.Timestamp(times.max()).isoformat()
+
+
+def load_catalog(nc_files: list[Path]) -> pd.DataFrame:
+    """Build or refresh the cached time-coverage catalog for `nc_files`.
+
+    Only files that are new or changed since the catalog was written (by
+    size and mtime) are opened; everything else comes from CATALOG_PATH.
+
+    Returns:
+        DataFrame with columns path, start, end, sorted by start time
+    """
+    catalog = json.loads(CATALOG_PATH.read_text()) if CATALOG_PATH.exists() else {}
+    present = {f.name for f in nc_files}
+    catalog = {name: entry for name, entry in catalog.items() if name in present}
+
+    n_scanned = 0
+    for f in nc_files:
+        entry = catalog.get(f.name)
+        key = file_identity(f)
+        if entry is None or entry['key'] != key:
+            catalog[f.name] = {'key': key, 'coverage': read_time_coverage(f)}
+            n_scanned += 1
+
+    if n_scanned:
+        print(f'  Catalog: scanned time coverage of {n_scanned} files')
+        CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CATALOG_PATH.write_text(json.dumps(catalog, indent=1))
+
+    rows = [
+        {'path': f, 'start': pd.Timestamp(cov[0]), 'end': pd.Timestamp(cov[1])}
+        for f in nc_files
+        if (cov := catalog[f.name]['coverage']) is not None
+    ]
+    df_catalog = pd.DataFrame(rows, columns=['path', 'start', 'end'])
+    return df_catalog.sort_values('start', kind='stable').reset_index(drop=True)
+
+
+def select_files(df_catalog: pd.DataFrame, start: pd.Timestamp,
+                 end: pd.Timestamp) -> pd.DataFrame:
+    """Return catalog rows whose time coverage overlaps [start, end].
+
+    Files are sorted by start time, so a binary search bounds the candidates
+    that start before the window ends; of those, only files ending after the
+    window starts overlap it. Returned rows are in filename order.
+    """
+    n_candidates = np.searchsorted(df_catalog['start'].values, np.datetime64(end), side='right')
+    candidates = df_catalog.iloc[:n_candidates]
+    overlapping = candidates[candidates['end'] >= start]
+    return overlapping.sort_values('path').reset_index(drop=True)
+
+
+def file_cutoffs(df_selected: pd.DataFrame) -> list[np.datetime64 | None]:
+    """Sample cutoff for each selected file, so overlapping samples are read once.
+
+    OOI files can overlap in time. Each file only contributes samples after
+    the last timestamp of every file before it in filename order (the first
+    file wins, as the hourly deduplication used to do), so per-file hourly
+    aggregates can simply be merged.
+    """
+    previous_end = df_selected['end'].cummax().shift(1)
+    return [None if pd.isna(t) else np.datetime64(t, 'ns') for t in previous_end]
+
+
+def find_input_files() -> tuple[list[Path], pd.DataFrame]:
+    """List NetCDF files in DATA_DIR and select those overlapping the time range.
+
+    Returns:
+        Tuple of (all NetCDF files, DataFrame of the files overlapping
+        TIME_START..TIME_END with columns path, start, end and after (the
+        sample cutoff from file_cutoffs()), in filename order)
+    """
+    print('=' * 60)
+    print('ASHES TMPSF Temperature Analysis')
+    print(f'Time range: {TIME_START} to {TIME_END}')
+    print('=' * 60)
+
+    print(f'\nData directory: {DATA_DIR}')
+
+    # Select files by their actual time coverage
+    nc_files = sorted(DATA_DIR.glob('*.nc'))
+    window_start, window_end = time_window()
+    df_selected = select_files(load_catalog(nc_files), window_start, window_end)
+    df_selected['after'] = pd.Series(file_cutoffs(df_selected), index=df_selected.index,
+                                     dtype=object)
+
+    print(f'Found {len(df_selected)} of {len(nc_files)} files overlapping {TIME_START} to {TIME_END}')
+    return nc_files, df_selected
+
+
+def load_data(n_workers: int | None = None, incremental: bool = False,
+              reader: str | None = None) -> tuple[pd.DataFrame, dict]:
+    """Load NetCDF files containing data within the time range.
+
+    Uses a cached time-coverage catalog for file filtering, QARTOD QC filtering,
+    and hourly aggregation for memory-efficient loading of multi-year data.
+    Files are processed independently, optionally in a pool of worker processes,
+    and each is reduced to per-hour count, sum, sum of squares, min and max.
+    The per-file aggregates are merged hour by hour, so an hour split across
+    two files keeps the samples from both.
+
+    In incremental mode, per-file aggregates and QC counts are kept in a
+    content-addressed cache (see cache_key()), and only files without a
+    cached result for the current parameters and code are read. When every
+    file hits, no NetCDF file is opened, so changes that only affect later
+    stages (consistency threshold, figures) skip ingest entirely. The result
+    is the same as a full reload.
+
+    Args:
+        n_workers: Number of worker processes (defaults to N_WORKERS; 1 = serial)
+        incremental: Reuse cached per-file results from CACHE_DIR
+        reader: Reader backend in READERS (defaults to READER)
+
+    Returns:
+        Tuple of (hourly aggregate DataFrame of QC-filtered temperature data
+        (see accumulate_hourly()), QC statistics dict)
+    """
+    nc_files, df_files = find_input_files()
+    files, cutoffs = list(df_files['path']), list(df_files['after'])
+
+    reader = reader or READER
+    if incremental:
+        code_hash = ingest_code_hash()
+        keys = [cache_key(row.path, row.start, row.end, row.after, code_hash, reader)
+                for row in df_files.itertuples()]
+        index = load_cache_index()
+        chunks = [cache_get(index, key) for key in keys]
+        misses = [i for i, chunk in enumerate(chunks) if chunk is None]
+        print(f'Cache: {len(files) - len(misses)} hits, {len(misses)} misses')
+        if misses:
+            ingested = ingest_files([files[i] for i in misses], [cutoffs[i] for i in misses],
+                                    n_workers, reader)
+            for i, result in zip(misses, ingested):
+                cache_put(index, keys[i], files[i], result, code_hash)
+                chunks[i] = result
+        prune_cache_index(index, nc_files, code_hash)
+        save_cache_index(index)
+    else:
+        chunks = ingest_files(files, cutoffs, n_workers, reader)
+
+    return merge_file_results(chunks)
+
+
+def merge_file_results(chunks: list[tuple]) -> tuple[pd.DataFrame, dict]:
+    """Merge per-file (aggregates, QC counts) results from load_file().
+
+    Returns:
+        Tuple of (merged hourly aggregate DataFrame, QC statistics dict)
+    """
+    qc_counts = {var: {'total': 0, 'passed': 0, 'failed': 0} for var in TEMP_VARS}
+    aggs = []
+    for agg, file_counts in chunks:
+        merge_qc_counts(qc_counts, file_counts)
+        if agg is not None:
+            aggs.append(agg)
+
+    print('Merging hourly aggregates...')
+    with run_stage('load_data: merge', rows_in=sum(len(a) for a in aggs)) as st:
+        agg = merge_aggregates(aggs)
+        st['rows_out'] = len(agg)
+
+    print(f'Loaded {len(agg):,} hourly observations')
+    return agg, qc_counts
+
+
+def fetch_and_load(base_url: str, n_workers: int | None = None, reader: str | None = None,
+                   max_connections: int | None = None) -> tuple[pd.DataFrame, dict]:
+    """Fetch the remote archive into DATA_DIR and ingest files while downloading.
+
+    Files are ingested in filename order with the overlap cutoffs of
+    load_data(), so each file starts as soon as it and every file before it
+    have arrived; the result is the same as fetch_data() then load_data().
+    Time coverage comes from the catalog (see load_catalog()), so only
+    downloaded files are opened for it.
+
+    Args:
+        base_url: URL of the remote directory listing
+        n_workers: Number of ingest worker processes (defaults to N_WORKERS)
+        reader: Reader backend in READERS (defaults to READER)
+        max_connections: Connection pool size (defaults to fetch.FETCH_MAX_CONNECTIONS)
+
+    Returns:
+        Tuple of (hourly aggregate DataFrame, QC statistics dict), as load_data()
+    """
+    from fetch import fetch_archive
+
+    n_workers = n_workers if n_workers is not None else N_WORKERS
+    window_start, window_end = time_window()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        executor = worker_pool(n_workers) if n_workers > 1 else ThreadPoolExecutor(1)
+        candidates, downloading, futures = None, set(), []
+        cataloged, previous_end = {}, None
+
+        def catalog_coverage(downloading: frozenset) -> dict:
+            # Coverage of the local files that are not being downloaded; only
+            # files downloaded since the last call are opened
+            df_catalog = load_catalog([f for f in sorted(DATA_DIR.glob('*.nc')) if f.name not in downloading])
+            return {row.path.name: (row.start, row.end) for row in df_catalog.itertuples()}
+
+        async def start_ready():
+            # Submit files in filename order while neither they nor any
+            # file before them is still downloading; catalog updates run in
+            # a thread so downloads keep going
+            nonlocal cataloged, previous_end
+            while candidates and candidates[0] not in downloading:
+                name = candidates.pop(0)
+                if name not in cataloged:
+                    cataloged = await asyncio.to_thread(catalog_coverage, frozenset(downloading))
+                coverage = cataloged.get(name)
+                if coverage is None:
+                    continue
+                start, end = coverage
+                if end < window_start or start > window_end:
+                    continue
+                after = None if previous_end is None else np.datetime64(previous_end, 'ns')
+                previous_end = end if previous_end is None else max(previous_end, end)
+                futures.append(loop.run_in_executor(
+                    executor, load_file_instrumented, DATA_DIR / name, after, reader))
+
+        with executor:
+            async for _, downloading in fetch_archive(base_url, DATA_DIR, (window_start, window_end),
+                                                      max_connections):
+                if candidates is None:
+                    candidates = sorted({f.name for f in DATA_DIR.glob('*.nc')} | downloading)
+                await start_ready()
+            if candidates is None:
+                candidates = sorted(f.name for f in DATA_DIR.glob('*.nc'))
+            await start_ready()
+            return await asyncio.gather(*futures)
+
+    chunks = []
+    for result, metrics in asyncio.run(run()):
+        chunks.append(result)
+        RUN_REPORT['files'].append(metrics)
+    print(f'Ingested {len(chunks)} files')
+    return merge_file_results(chunks)
+
+
+def load_batch_jobs(path: Path) -> list[PipelineConfig]:
+    """Read a batch job list: a JSON array of objects with any of the
+    PipelineConfig fields (missing keys use the module defaults)."""
+    jobs = json.loads(Path(path).read_text())
+    allowed = {f.name for f in fields(PipelineConfig)}
+    for i, job in enumerate(jobs):
+        if not set(job) <= allowed:
+            raise ValueError(f'Job {i}: unknown keys {sorted(set(job) - allowed)}')
+    return [PipelineConfig(**job) for job in jobs]
+
+
+def run_batch(jobs: list[PipelineConfig], n_workers: int | None = None,
+              reader: str | None = None) -> list[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """Run the hourly pipeline for several (data dir, window, output dir) jobs.
+
+    File ingests of all jobs share one worker pool, and a file used by
+    several jobs is read once (see load_file_windows()). Each job's outputs
+    are produced in the main process as soon as all of its files are in,
+    while ingest for later jobs continues; per-job results are the same as
+    running main() for each job with the same settings.
+
+    Args:
+        jobs: One PipelineConfig per job
+        n_workers: Number of worker processes (defaults to N_WORKERS; 1 = serial)
+        reader: Reader backend in READERS (defaults to READER)
+
+    Returns:
+        Per job, the (df, df_daily, df_stats) tuple main() returns
+    """
+    n_workers = n_workers if n_workers is not None else N_WORKERS
+
+    # Plan every job's files and cutoffs, grouping jobs by file
+    plans, file_windows = [], {}
+    for i, job in enumerate(jobs):
+        with job.apply():
+            _, df_files = find_input_files()
+            if df_files.empty:
+                raise ValueError(f'Job {i}: no files overlap {TIME_START} to {TIME_END} in {DATA_DIR}')
+            window = (TIME_START, TIME_END)
+        plans.append([f.resolve() for f in df_files['path']])
+        for row in df_files.itertuples():
+            file_windows.setdefault(row.path.resolve(), []).append((i, *window, row.after))
+    n_reads = sum(len(p) for p in plans)
+    print(f'\nBatch: {len(jobs)} jobs, {n_reads} file reads -> {len(file_windows)} unique files')
+
+    chunks = [{} for _ in jobs]
+    file_metrics = [[] for _ in jobs]
+    outputs = [None] * len(jobs)
+
+    def deliver(path, results, metrics):
+        for (i, *_), result in zip(file_windows[path], results):
+            chunks[i][path] = result
+            file_metrics[i].append(metrics)
+            if len(chunks[i]) == len(plans[i]):
+                outputs[i] = finish_job(i)
+
+    def finish_job(i):
+        with jobs[i].apply():
+            print(f'\n{"=" * 60}\nBatch job {i + 1}/{len(jobs)}: {DATA_DIR} '
+                  f'{TIME_START} to {TIME_END} -> {OUTPUT_DIR}')
+            RUN_REPORT.update(stages=[], files=file_metrics[i],
+                              started=datetime.now(timezone.utc).isoformat(),
+                              options={'n_workers': n_workers, 'reader': reader or READER,
+                                       'batch_job': jobs[i].describe()})
+            with run_stage('load_data') as st:
+                agg, qc_counts = merge_file_results([chunks[i][p] for p in plans[i]])
+                st['rows_in'] = sum(f['rows_in'] for f in file_metrics[i])
+                st['rows_out'] = len(agg)
+            df, df_values, agg, qc_mask, deviation = run_hourly_qc(agg, qc_counts)
+            df_daily, df_stats = run_outputs(df, df_values, agg, qc_mask, deviation)
+            write_run_report(REPORT_PATH)
+        chunks[i].clear()
+        return df, df_daily, df_stats
+
+    # Submit files in job order so the first jobs complete first
+    order = list(dict.fromkeys(path for plan in plans for path in plan))
+    if n_workers > 1:
+        # Ingest workers get each job's window explicitly; figure workers
+        # started by finish_job() get that job's output paths and style
+        with worker_pool(n_workers) as pool:
+            futures = {pool.submit(load_file_windows, path,
+                                   [w[1:] for w in file_windows[path]], reader): path
+                       for path in order}
+            for future in as_completed(futures):
+                deliver(futures[future], *future.result())
+    else:
+        for path in order:
+            deliver(path, *load_file_windows(path, [w[1:] for w in file_windows[path]], reader))
+    return outputs
 
 
 def report_qc_stats(qc_counts: dict) -> None:
@@ -176,7 +1477,100 @@ def report_qc_stats(qc_counts: dict) -> None:
             print(f'    Channel {ch:02d}: {pct:5.1f}% failed ({n:,} values)')
 
 
-def apply_cross_channel_consistency(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+def leave_one_out_median(temp_data: np.ndarray) -> np.ndarray:
+    """Median of the other channels for every value, from one sort per row.
+
+    Equivalent to np.nanmedian(temp_data[:, others], axis=1) for each channel,
+    but each row is sorted once: dropping one value from a sorted row only
+    shifts the median between neighbouring order statistics, so the median of
+    the other channels can be read off at a rank-dependent offset.
+
+    Args:
+        temp_data: Array of shape (n_times, n_channels), NaN for missing
+
+    Returns:
+        Array of the same shape; NaN where a value is missing or no other
+        channel has data
+    """
+    n_times, n_channels = temp_data.shape
+
+    # Sort each row (NaNs last) and record every value's rank within its row
+    order = np.argsort(temp_data, axis=1, kind='stable')
+    sorted_data = np.take_along_axis(temp_data, order, axis=1)
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(n_channels), axis=1)
+
+    # Median positions among the other valid values, shifted past the value's
+    # own slot in the sorted row
+    n_others = (~np.isnan(temp_data)).sum(axis=1, keepdims=True) - 1
+    lo = (n_others - 1) // 2
+    hi = n_others // 2
+    lo = np.clip(lo + (lo >= rank), 0, n_channels - 1)
+    hi = np.clip(hi + (hi >= rank), 0, n_channels - 1)
+
+    median = (np.take_along_axis(sorted_data, lo, axis=1)
+              + np.take_along_axis(sorted_data, hi, axis=1)) / 2
+    median[np.isnan(temp_data) | (n_others < 1)] = np.nan
+    return median
+
+
+def consistency_deviation(temp_data: np.ndarray, chunk_size: int | None = None) -> np.ndarray:
+    """Deviation of every value from the median of the other channels.
+
+    Rows are processed in chunks so memory stays bounded for long or
+    sub-hourly records. Deviations are float32, half the size of the data,
+    for the saved deviation file and the threshold sweep; the consistency
+    check itself decides in float64 (see consistency_flags()).
+
+    Args:
+        temp_data: Array of shape (n_times, n_channels), NaN for missing
+        chunk_size: Rows per chunk (defaults to CONSISTENCY_CHUNK_ROWS)
+
+    Returns:
+        float32 array of the same shape; NaN where a value is missing or no
+        other channel has data
+    """
+    chunk_size = chunk_size or CONSISTENCY_CHUNK_ROWS
+    deviation = np.empty(temp_data.shape, dtype=np.float32)
+    for start in range(0, len(temp_data), chunk_size):
+        block = temp_data[start:start + chunk_size]
+        deviation[start:start + chunk_size] = block - leave_one_out_median(block)
+    return deviation
+
+
+def consistency_flags(temp_data: np.ndarray, threshold: float,
+                      chunk_size: int | None = None) -> np.ndarray:
+    """Flag values exceeding the median of the other channels by `threshold`.
+
+    The comparison is `value > median + threshold` in float64, so the flags
+    are exactly those of a per-channel np.nanmedian loop.
+
+    Args:
+        temp_data: Array of shape (n_times, n_channels), NaN for missing
+        threshold: Degrees C above the other-channel median to flag
+        chunk_size: Rows per chunk (defaults to CONSISTENCY_CHUNK_ROWS)
+
+    Returns:
+        Boolean array of the same shape, True for flagged values
+    """
+    chunk_size = chunk_size or CONSISTENCY_CHUNK_ROWS
+    flagged = np.zeros(temp_data.shape, dtype=bool)
+    for start in range(0, len(temp_data), chunk_size):
+        block = np.asarray(temp_data[start:start + chunk_size], dtype=np.float64)
+        # NaN values or medians (no other data) compare False
+        with np.errstate(invalid='ignore'):
+            flagged[start:start + chunk_size] = block > leave_one_out_median(block) + threshold
+    return flagged
+
+
+def consistency_deviation_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """consistency_deviation() of the 24 temperature channels as a DataFrame."""
+    return pd.DataFrame(consistency_deviation(df[TEMP_VARS].values),
+                        index=df.index, columns=TEMP_VARS)
+
+
+def apply_cross_channel_consistency(df: pd.DataFrame,
+                                    threshold: float | None = None) -> tuple[pd.DataFrame, dict]:
     """Apply cross-channel consistency check to flag single-channel spikes.
 
     For each observation, compares each channel's value to the median of all
@@ -188,47 +1582,72 @@ def apply_cross_channel_consistency(df: pd.DataFrame) -> tuple[pd.DataFrame, dic
 
     Args:
         df: DataFrame with temperature data (all 24 channels)
+        threshold: Degrees C above the median to flag (defaults to
+            CONSISTENCY_THRESHOLD)
 
     Returns:
         Tuple of (filtered DataFrame, statistics dict with flagged counts per channel)
     """
-    print(f'\nApplying cross-channel consistency check (threshold: {CONSISTENCY_THRESHOLD}C)...')
+    threshold = CONSISTENCY_THRESHOLD if threshold is None else threshold
+    print(f'\nApplying cross-channel consistency check (threshold: {threshold}C)...')
 
     df_filtered = df.copy()
     consistency_stats = {var: {'flagged': 0, 'total': 0} for var in TEMP_VARS}
 
     # Get temperature data as array for efficient computation
     temp_data = df_filtered[TEMP_VARS].values  # shape: (n_times, 24)
-    n_times, n_channels = temp_data.shape
-
-    # For each channel, compute median of OTHER channels and compare
-    flagged_mask = np.zeros_like(temp_data, dtype=bool)
+    flagged_mask = consistency_flags(temp_data, threshold)
 
+    valid_counts = (~np.isnan(temp_data)).sum(axis=0)
+    flagged_counts = flagged_mask.sum(axis=0)
     for i, var in enumerate(TEMP_VARS):
-        # Get indices of other channels
-        other_indices = [j for j in range(n_channels) if j != i]
-
-        # Compute median of other channels for each timestamp
-        other_median = np.nanmedian(temp_data[:, other_indices], axis=1)
-
-        # Flag where this channel exceeds median + threshold
-        channel_values = temp_data[:, i]
-        exceeds_threshold = channel_values > (other_median + CONSISTENCY_THRESHOLD)
-
-        # Only flag non-NaN values
-        valid_mask = ~np.isnan(channel_values)
-        flagged = exceeds_threshold & valid_mask
-
-        flagged_mask[:, i] = flagged
-        consistency_stats[var]['flagged'] = int(flagged.sum())
-        consistency_stats[var]['total'] = int(valid_mask.sum())
+        consistency_stats[var]['flagged'] = int(flagged_counts[i])
+        consistency_stats[var]['total'] = int(valid_counts[i])
 
     # Apply mask - set flagged values to NaN
     temp_data_filtered = temp_data.copy()
     temp_data_filtered[flagged_mask] = np.nan
     df_filtered[TEMP_VARS] = temp_data_filtered
 
-    # Report results
+    report_consistency_stats(consistency_stats)
+
+    return df_filtered, consistency_stats
+
+
+def sweep_consistency_thresholds(deviation: pd.DataFrame,
+                                 thresholds: list[float]) -> pd.DataFrame:
+    """Flagged counts of the consistency check for many thresholds at once.
+
+    Each channel's deviations are sorted once; the number of values above
+    any threshold is then a binary search, so the cost of extra thresholds
+    is negligible compared with rerunning the check.
+
+    Args:
+        deviation: consistency_deviation_frame() of the hourly data
+        thresholds: Candidate thresholds in degrees C
+
+    Returns:
+        DataFrame indexed by threshold with flagged counts per channel and a
+        'total' column; the same counts as apply_cross_channel_consistency()
+        except for values within float32 rounding of a threshold
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    ordered = np.sort(deviation[TEMP_VARS].values, axis=0)  # NaN last
+    n_valid = (~np.isnan(ordered)).sum(axis=0)
+
+    counts = np.empty((len(thresholds), len(TEMP_VARS)), dtype=np.int64)
+    for j in range(len(TEMP_VARS)):
+        values = ordered[:n_valid[j], j]
+        counts[:, j] = n_valid[j] - np.searchsorted(values, thresholds, side='right')
+
+    df_sweep = pd.DataFrame(counts, index=pd.Index(thresholds, name='threshold'),
+                            columns=TEMP_VARS)
+    df_sweep['total'] = df_sweep[TEMP_VARS].sum(axis=1)
+    return df_sweep
+
+
+def report_consistency_stats(consistency_stats: dict) -> None:
+    """Report cross-channel consistency check statistics."""
     total_flagged = sum(s['flagged'] for s in consistency_stats.values())
     total_obs = sum(s['total'] for s in consistency_stats.values())
     pct_flagged = (total_flagged / total_obs * 100) if total_obs > 0 else 0
@@ -249,7 +1668,479 @@ def apply_cross_channel_consistency(df: pd.DataFrame) -> tuple[pd.DataFrame, dic
         for ch, pct, n in sorted(channels_flagged, key=lambda x: -x[2]):
             print(f'    Channel {ch:02d}: {n:,} values ({pct:.2f}%)')
 
-    return df_filtered, consistency_stats
+
+def qc_block_full_resolution(times: np.ndarray, temps: np.ndarray, qc: np.ndarray,
+                              has_qc: np.ndarray) -> tuple[pd.DataFrame, dict]:
+    """QARTOD mask, consistency-check and hourly-aggregate one chunk of samples.
+
+    Args:
+        times: datetime64 sample times, shape (n_times,)
+        temps: Temperatures, shape (n_times, 24)
+        qc: QARTOD flags, same shape as temps
+        has_qc: Per-channel bool, False where the file has no QARTOD variable
+
+    Returns:
+        Tuple of (hourly aggregates from accumulate_hourly(), dict of
+        per-channel QARTOD and consistency counts for the chunk)
+    """
+    failed = (qc != QARTOD_PASS) & has_qc
+    masked = np.where(failed, np.nan, temps)
+    flagged = consistency_flags(masked, CONSISTENCY_THRESHOLD)
+    counts = {
+        'has_qc': has_qc,
+        'total': (~np.isnan(temps)).sum(axis=0),
+        'failed': failed.sum(axis=0),
+        'checked': (~np.isnan(masked)).sum(axis=0),
+        'flagged': flagged.sum(axis=0),
+    }
+    masked[flagged] = np.nan
+    flags = {
+        'n_qartod_fail': (qc == QARTOD_FAIL) & has_qc,
+        'n_qartod_suspect': (qc == QARTOD_SUSPECT) & has_qc,
+        'n_consistency': flagged,
+    }
+    return accumulate_hourly(times, masked, TEMP_VARS, flags), counts
+
+
+def load_data_full_resolution(n_workers: int | None = None) -> tuple[pd.DataFrame, dict, dict]:
+    """Load data and run both QC stages at full sample rate with dask.
+
+    Each file is opened lazily in time chunks of FULL_RES_CHUNK_ROWS samples
+    (all 24 channels per chunk). QARTOD masking and the cross-channel
+    consistency check are applied to every raw sample, and each chunk is
+    reduced to hourly aggregates before anything is gathered, so memory is
+    bounded by the chunk size and worker count rather than the archive size.
+    Short single-channel spikes are therefore flagged before they are
+    averaged into an hourly mean.
+
+    Chunk aggregates are merged across chunks and files, with overlapping
+    samples read once, as in load_data().
+
+    Args:
+        n_workers: Number of dask worker threads (defaults to FULL_RES_WORKERS)
+
+    Returns:
+        Tuple of (hourly aggregate DataFrame of fully QC'd data, QARTOD QC
+        statistics dict, consistency statistics dict)
+    """
+    import dask
+    import dask.array as da
+    import xarray as xr
+
+    _, df_files = find_input_files()
+    files, cutoffs = list(df_files['path']), list(df_files['after'])
+    n_workers = n_workers if n_workers is not None else FULL_RES_WORKERS
+
+    datasets = []
+    tasks = []
+    for f, after in zip(files, cutoffs):
+        ds = xr.open_dataset(f, chunks={'obs': FULL_RES_CHUNK_ROWS})
+        datasets.append(ds)
+        ds = ds.swap_dims({'obs': 'time'}).sel(time=slice(TIME_START, TIME_END))
+        if after is not None:
+            ds = ds.isel(time=ds['time'].values > after)
+        n_times = ds.sizes['time']
+        if n_times == 0:
+            continue
+
+        # Lazy (n_times, 24) arrays chunked along time only, so every chunk
+        # holds all channels for the consistency check
+        row_chunks = ds[TEMP_VARS[0]].chunks[0] if TEMP_VARS[0] in ds else FULL_RES_CHUNK_ROWS
+        has_qc = np.array([q in ds.data_vars for q in QARTOD_VARS])
+        temps = da.stack([
+            ds[v].data if v in ds.data_vars else da.full(n_times, np.nan, chunks=row_chunks)
+            for v in TEMP_VARS
+        ], axis=1).rechunk({1: -1})
+        qc = da.stack([
+            ds[q].data if q in ds.data_vars else da.full(n_times, QARTOD_PASS, chunks=row_chunks)
+            for q in QARTOD_VARS
+        ], axis=1).rechunk(temps.chunks)
+
+        times = ds['time'].values
+        bounds = np.cumsum((0,) + temps.chunks[0])
+        tasks.extend(
+            dask.delayed(qc_block_full_resolution)(times[lo:hi], temps_block, qc_block, has_qc)
+            for lo, hi, temps_block, qc_block in zip(
+                bounds[:-1], bounds[1:], temps.to_delayed().ravel(), qc.to_delayed().ravel())
+        )
+
+    print(f'Processing {len(files)} files at full resolution '
+          f'({FULL_RES_CHUNK_ROWS:,}-sample chunks, {n_workers} workers)...')
+    (results,) = dask.compute(tasks, num_workers=n_workers)
+    for ds in datasets:
+        ds.close()
+
+    qc_counts = {var: {'total': 0, 'passed': 0, 'failed': 0} for var in TEMP_VARS}
+    consistency_stats = {var: {'flagged': 0, 'total': 0} for var in TEMP_VARS}
+    for _, counts in results:
+        for j, var in enumerate(TEMP_VARS):
+            if counts['has_qc'][j]:
+                qc_counts[var]['total'] += int(counts['total'][j])
+                qc_counts[var]['failed'] += int(counts['failed'][j])
+                qc_counts[var]['passed'] += int(counts['total'][j] - counts['failed'][j])
+            consistency_stats[var]['total'] += int(counts['checked'][j])
+            consistency_stats[var]['flagged'] += int(counts['flagged'][j])
+
+    # Chunks and files can split an hour; merge their accumulators
+    print('Merging hourly aggregates...')
+    agg = merge_aggregates([block_agg for block_agg, _ in results])
+
+    print(f'Loaded {len(agg):,} hourly observations')
+    return agg, qc_counts, consistency_stats
+
+
+def segment_costs(cum: tuple, lo: np.ndarray | int, hi: int) -> np.ndarray:
+    """Gaussian mean-change cost of the segments [lo, hi) of every channel.
+
+    `cum` holds cumulative valid counts, sums and sums of squares (rows are
+    positions, columns channels), so any segment's residual sum of squares
+    costs O(1); segments without valid values cost 0.
+    """
+    cn, cs1, cs2 = cum
+    n = cn[hi] - cn[lo]
+    s1 = cs1[hi] - cs1[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, cs2[hi] - cs2[lo] - s1**2 / n, 0.0)
+
+
+def pelt(cum: tuple, penalty: np.ndarray, min_size: int) -> list[np.ndarray]:
+    """Optimal mean-change segmentation of all channels with PELT.
+
+    Minimizes total segment cost plus `penalty` per change. All channels are
+    solved in the same pass over positions: each step scores the union of
+    the channels' surviving candidate change points at once, and candidates
+    that can no longer be optimal are pruned per channel, which keeps the
+    work close to linear in the series length.
+
+    Args:
+        cum: Cumulative (count, sum, sum of squares) arrays, shape (n + 1, n_channels)
+        penalty: Cost of one change point, per channel
+        min_size: Minimum segment length (positions)
+
+    Returns:
+        Per channel, the sorted change positions (segment starts after the first)
+    """
+    n_pos, n_channels = cum[0].shape[0] - 1, cum[0].shape[1]
+    best = np.full((n_pos + 1, n_channels), np.inf)
+    best[0] = -penalty
+    previous = np.zeros((n_pos + 1, n_channels), dtype=np.int64)
+    channels = np.arange(n_channels)
+
+    candidates = np.array([0])
+    active = np.ones((1, n_channels), dtype=bool)
+    for t in range(1, n_pos + 1):
+        eligible = (candidates <= t - min_size)[:, None] & active
+        if eligible.any():
+            total = best[candidates] + segment_costs(cum, candidates, t)
+            scored = np.where(eligible, total, np.inf)
+            k = scored.argmin(axis=0)
+            best[t] = scored[k, channels] + penalty
+            previous[t] = candidates[k]
+            # Prune candidates that cannot start the last segment of any
+            # later optimal segmentation of that channel
+            active &= ~(eligible & (total > best[t]))
+        keep = active.any(axis=1)
+        candidates = np.append(candidates[keep], t)
+        active = np.vstack([active[keep], np.ones((1, n_channels), dtype=bool)])
+
+    changes = []
+    for c in range(n_channels):
+        points, t = [], n_pos
+        while t > 0 and np.isfinite(best[t, c]):
+            t = previous[t, c]
+            if t > 0:
+                points.append(t)
+        changes.append(np.array(points[::-1], dtype=np.int64))
+    return changes
+
+
+def detect_changepoints(df: pd.DataFrame, penalty: float | None = None,
+                        min_days: int | None = None) -> pd.DataFrame:
+    """Detect level changes in every channel of the QC'd hourly series.
+
+    PELT runs on daily blocks, using per-day sums of the hourly values so
+    the cost of a multi-day segment is exact. Each change is then moved to
+    the best hour within a day on either side. Costs are scaled by each
+    channel's hour-to-hour noise variance (robust MAD estimate), so one
+    penalty suits all channels. Gaps are skipped, not interpolated.
+
+    Args:
+        df: QC'd hourly means (e.g. from apply_cross_channel_consistency())
+        penalty: Change penalty in log(n_hours) noise variances
+            (defaults to CHANGEPOINT_PENALTY)
+        min_days: Minimum segment length in days (defaults to CHANGEPOINT_MIN_DAYS)
+
+    Returns:
+        DataFrame with one row per change: channel, variable, onset,
+        magnitude (mean after - mean before, C), mean_before, mean_after and
+        duration_hours (until the next change or the end of the record)
+    """
+    penalty = CHANGEPOINT_PENALTY if penalty is None else penalty
+    min_days = min_days or CHANGEPOINT_MIN_DAYS
+    df = df[TEMP_VARS].asfreq('h')
+    values = df.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore'):
+        centered = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+        noise_var = (1.4826 * np.nanmedian(np.abs(np.diff(values, axis=0)), axis=0))**2 / 2
+    noise_var = np.where(noise_var > 0, noise_var, 1.0)
+
+    def cumulative(a):
+        return np.vstack([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+    hourly = (cumulative(valid.astype(np.float64)), cumulative(centered), cumulative(centered**2))
+
+    # Day boundaries as hour positions; daily cumulative sums are the hourly
+    # ones sampled there
+    days = df.index.normalize().asi8
+    edges = np.r_[np.flatnonzero(np.r_[True, days[1:] != days[:-1]]), len(df)]
+    daily = tuple(c[edges] for c in hourly)
+    scaled = (daily[0], daily[1] / np.sqrt(noise_var), daily[2] / noise_var)
+    changes = pelt(scaled, penalty * np.log(len(df)) * np.ones(len(TEMP_VARS)), min_days)
+
+    rows = []
+    for c, blocks in enumerate(changes):
+        bounds = np.r_[0, edges[blocks], len(df)]
+        for k in range(1, len(bounds) - 1):
+            # Best hour for the change within a day of the block boundary
+            lo, hi = bounds[k - 1], bounds[k + 1]
+            hours = np.arange(max(lo + 1, bounds[k] - 24), min(hi, bounds[k] + 24))
+            one = tuple(cum[:, c] for cum in hourly)
+            cost = segment_costs(one, lo, hours) + segment_costs(one, hours, hi)
+            bounds[k] = hours[np.argmin(cost)]
+        cn, cs1 = hourly[0][:, c], hourly[1][:, c]
+        offset = values[valid[:, c], c].mean() if valid[:, c].any() else 0.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (cs1[bounds[1:]] - cs1[bounds[:-1]]) / (cn[bounds[1:]] - cn[bounds[:-1]]) + offset
+        for k in range(1, len(bounds) - 1):
+            rows.append({
+                'channel': c + 1,
+                'variable': TEMP_VARS[c],
+                'onset': df.index[bounds[k]],
+                'magnitude': means[k] - means[k - 1],
+                'mean_before': means[k - 1],
+                'mean_after': means[k],
+                'duration_hours': int(bounds[k + 1] - bounds[k]),
+            })
+    columns = ['channel', 'variable', 'onset', 'magnitude', 'mean_before', 'mean_after',
+               'duration_hours']
+    return pd.DataFrame(rows, columns=columns).sort_values(['onset', 'channel'], ignore_index=True)
+
+
+def group_events(df_changes: pd.DataFrame, window_hours: float | None = None,
+                 min_channels: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Group change points that occur at once across many channels.
+
+    Changes are clustered in onset order: a cluster collects every change
+    within `window_hours` of its first one. Clusters spanning at least
+    `min_channels` distinct channels are multi-channel events.
+
+    Returns:
+        Tuple of (df_changes with an event_id column, <NA> for changes not in
+        an event; events DataFrame with event_id, onset, last_onset,
+        n_channels, channels, mean_magnitude, max_abs_magnitude and
+        median_duration_hours)
+    """
+    window = pd.Timedelta(hours=window_hours or EVENT_WINDOW_HOURS)
+    min_channels = min_channels or EVENT_MIN_CHANNELS
+    df_changes = df_changes.sort_values(['onset', 'channel'], ignore_index=True)
+
+    onsets = df_changes['onset'].to_numpy()
+    cluster = np.zeros(len(df_changes), dtype=np.int64)
+    start = None
+    for i, onset in enumerate(onsets):
+        if start is None or onset - start > window:
+            start = onset
+            cluster[i] = cluster[i - 1] + 1 if i else 0
+        else:
+            cluster[i] = cluster[i - 1]
+
+    event_id = pd.Series(pd.NA, index=df_changes.index, dtype='Int64')
+    events = []
+    for _, group in df_changes.groupby(cluster):
+        if group['channel'].nunique() < min_channels:
+            continue
+        event_id[group.index] = len(events)
+        events.append({
+            'event_id': len(events),
+            'onset': group['onset'].min(),
+            'last_onset': group['onset'].max(),
+            'n_channels': group['channel'].nunique(),
+            'channels': ','.join(f'{c:02d}' for c in sorted(group['channel'].unique())),
+            'mean_magnitude': group['magnitude'].mean(),
+            'max_abs_magnitude': group['magnitude'].abs().max(),
+            'median_duration_hours': group['duration_hours'].median(),
+        })
+    df_changes['event_id'] = event_id
+    columns = ['event_id', 'onset', 'last_onset', 'n_channels', 'channels', 'mean_magnitude',
+               'max_abs_magnitude', 'median_duration_hours']
+    return df_changes, pd.DataFrame(events, columns=columns)
+
+
+def detect_events(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-channel change points and multi-channel thermal events.
+
+    Returns:
+        Tuple of (per-channel changes, multi-channel events); see
+        detect_changepoints() and group_events()
+    """
+    print('\nDetecting change points and thermal events...')
+    df_changes, df_events = group_events(detect_changepoints(df))
+    print(f'  {len(df_changes)} channel change points, {len(df_events)} events on '
+          f'{EVENT_MIN_CHANNELS}+ channels')
+    largest = df_events.sort_values('n_channels', ascending=False, kind='stable').head(5)
+    for event in largest.sort_values('onset').itertuples():
+        print(f'    {event.onset:%Y-%m-%d %H:%M}: {event.n_channels} channels, '
+              f'mean change {event.mean_magnitude:+.2f}C')
+    return df_changes, df_events
+
+
+def coverage_states(qc_mask: pd.DataFrame, start: str | pd.Timestamp | None = None,
+                    end: str | pd.Timestamp | None = None) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Hourly COVERAGE_STATES code of every channel from the QC provenance mask.
+
+    An hour is 'consistency' if its value was removed by the consistency
+    check, 'qartod' if no sample passed QARTOD but some were flagged fail or
+    suspect, 'no_data' if it had no samples (including hours outside the
+    mask), and 'valid' otherwise.
+
+    Returns:
+        Tuple of (hourly index over start..end, int8 codes (n_hours, 24))
+    """
+    window_start, window_end = time_window(None if start is None else str(start),
+                                           None if end is None else str(end))
+    hours = pd.date_range(window_start.floor('h'), window_end.floor('h'), freq='h',
+                          name=qc_mask.index.name)
+    mask = qc_mask.reindex(hours)
+    bits = {name: unpack_channel_bits(mask[name].fillna(0).to_numpy(np.uint32))
+            for name in QC_MASK_COLUMNS}
+    bits['qc_gap'] |= mask['qc_gap'].isna().to_numpy()[:, None]
+
+    states = np.zeros(bits['qc_gap'].shape, dtype=np.int8)
+    states[bits['qc_gap']] = COVERAGE_STATES.index('no_data')
+    states[bits['qc_gap'] & (bits['qc_qartod_fail'] | bits['qc_qartod_suspect'])] = \
+        COVERAGE_STATES.index('qartod')
+    states[bits['qc_consistency']] = COVERAGE_STATES.index('consistency')
+    return hours, states
+
+
+def build_coverage_index(qc_mask: pd.DataFrame, start: str | pd.Timestamp | None = None,
+                         end: str | pd.Timestamp | None = None) -> pd.DataFrame:
+    """Run-length encode each channel's hourly coverage state.
+
+    Args:
+        qc_mask: Hourly QC provenance from build_qc_mask()
+        start: First hour (defaults to TIME_START)
+        end: Range end (inclusive; defaults to TIME_END)
+
+    Returns:
+        DataFrame with one row per run: channel, start, n_hours and state
+        (categorical COVERAGE_STATES), ordered by channel and start
+    """
+    hours, states = coverage_states(qc_mask, start, end)
+    by_channel = states.T
+    change = np.ones(by_channel.shape, dtype=bool)
+    change[:, 1:] = by_channel[:, 1:] != by_channel[:, :-1]
+    channel, first = np.nonzero(change)
+
+    # Each run ends where the next one starts (or at the end of the range)
+    last = np.r_[first[1:], 0]
+    last[np.r_[channel[1:] != channel[:-1], True]] = len(hours)
+    return pd.DataFrame({
+        'channel': (channel + 1).astype(np.int8),
+        'start': hours[first],
+        'n_hours': (last - first).astype(np.int32),
+        'state': pd.Categorical.from_codes(by_channel[channel, first], COVERAGE_STATES),
+    })
+
+
+def coverage_run_ends(coverage: pd.DataFrame) -> pd.Series:
+    """Exclusive end time of each run in a coverage index."""
+    return coverage['start'] + pd.to_timedelta(coverage['n_hours'], unit='h')
+
+
+def channel_coverage(start: str | pd.Timestamp | None = None, end: str | pd.Timestamp | None = None,
+                     coverage: pd.DataFrame | None = None) -> pd.Series:
+    """Fraction of hours with valid data per channel in a time range.
+
+    Computed from the run-length index alone, e.g. channels with at least
+    90 % coverage: `cov = channel_coverage('2016', '2017'); cov[cov >= 0.9]`.
+
+    Args:
+        start: Range start (inclusive; defaults to TIME_START)
+        end: Range end (inclusive; a date string covers the whole day)
+        coverage: Coverage index (loaded from COVERAGE_PATH if omitted)
+
+    Returns:
+        Series indexed by variable
+    """
+    coverage = coverage if coverage is not None else load_coverage_index()
+    lo, hi = time_window(None if start is None else str(start), None if end is None else str(end))
+    lo, hi = lo.floor('h'), hi.floor('h') + pd.Timedelta(hours=1)
+    overlap = (np.minimum(coverage_run_ends(coverage), hi) - np.maximum(coverage['start'], lo))
+    n_valid = (overlap.clip(lower=pd.Timedelta(0)) / pd.Timedelta(hours=1)).where(
+        coverage['state'] == 'valid', 0)
+    per_channel = n_valid.groupby(coverage['channel']).sum()
+    fraction = per_channel.reindex(range(1, len(TEMP_VARS) + 1), fill_value=0) / ((hi - lo) / pd.Timedelta(hours=1))
+    fraction.index = TEMP_VARS
+    return fraction
+
+
+def list_gaps(min_hours: float | None = None, start: str | pd.Timestamp | None = None,
+              end: str | pd.Timestamp | None = None, channels: list[str] | None = None,
+              coverage: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Stretches without valid data, from the run-length index alone.
+
+    Adjacent non-valid runs (e.g. an outage followed by QARTOD-failed hours)
+    are merged into one gap.
+
+    Args:
+        min_hours: Shortest gap to list (defaults to COVERAGE_GAP_HOURS)
+        start: Only gaps ending after this time (defaults to TIME_START)
+        end: Only gaps starting before this time (inclusive; defaults to TIME_END)
+        channels: Variables to include (defaults to all)
+        coverage: Coverage index (loaded from COVERAGE_PATH if omitted)
+
+    Returns:
+        DataFrame with channel, variable, start, end (exclusive), n_hours and
+        causes (the states involved, e.g. 'no_data+qartod'), by start time
+    """
+    coverage = coverage if coverage is not None else load_coverage_index()
+    min_hours = COVERAGE_GAP_HOURS if min_hours is None else min_hours
+    lo, hi = time_window(None if start is None else str(start), None if end is None else str(end))
+
+    # A new gap starts after every valid run and at every channel change
+    invalid = coverage['state'] != 'valid'
+    breaks = ~invalid | (coverage['channel'] != coverage['channel'].shift())
+    runs = coverage.assign(end=coverage_run_ends(coverage), gap=breaks.cumsum())[invalid]
+    gaps = runs.groupby('gap', sort=False).agg(
+        channel=('channel', 'first'), start=('start', 'first'), end=('end', 'last'),
+        n_hours=('n_hours', 'sum'),
+        causes=('state', lambda s: '+'.join(sorted(set(s.astype(str))))))
+    gaps.insert(1, 'variable', [TEMP_VARS[c - 1] for c in gaps['channel']])
+    keep = (gaps['n_hours'] >= min_hours) & (gaps['end'] > lo) & (gaps['start'] <= hi)
+    if channels is not None:
+        keep &= gaps['variable'].isin(channels)
+    return gaps[keep].sort_values(['start', 'channel'], ignore_index=True)
+
+
+def valid_hours(coverage: pd.DataFrame, hours: pd.DatetimeIndex) -> np.ndarray:
+    """True for each of `hours` that lies in a valid run of any channel."""
+    valid = coverage[coverage['state'] == 'valid']
+    depth = np.zeros(len(hours) + 1, dtype=np.int64)
+    np.add.at(depth, hours.searchsorted(pd.DatetimeIndex(valid['start'])), 1)
+    np.add.at(depth, hours.searchsorted(pd.DatetimeIndex(coverage_run_ends(valid))), -1)
+    return np.cumsum(depth[:-1]) > 0
+
+
+def report_coverage(coverage: pd.DataFrame) -> None:
+    """Print coverage per channel and the number of long gaps."""
+    fraction = channel_coverage(coverage=coverage)
+    gaps = list_gaps(coverage=coverage)
+    print(f'\nCoverage ({TIME_START} to {TIME_END}): '
+          f'{(fraction >= 0.9).sum()} of {len(fraction)} channels have >= 90% valid hours')
+    print(f'  Lowest: ' + ', '.join(f'{var} {frac:.1%}' for var, frac in fraction.nsmallest(3).items()))
+    print(f'  {len(gaps)} gaps of {COVERAGE_GAP_HOURS}+ hours '
+          f'({len(coverage)} runs in the coverage index)')
 
 
 def validate_data(df: pd.DataFrame) -> None:
@@ -283,20 +2174,148 @@ def validate_data(df: pd.DataFrame) -> None:
         print(f'  WARNING: Temperature values outside expected range (0-400C)')
 
 
-def compute_daily_mean(df: pd.DataFrame) -> pd.DataFrame:
+def compute_daily_mean(agg: pd.DataFrame, coverage: pd.DataFrame | None = None) -> pd.DataFrame:
     """Compute daily average temperature for all 24 channels.
 
+    Daily means are taken from the merged hourly accumulators, so every
+    sample carries equal weight regardless of how many samples its hour has.
+    With a coverage index, only hours inside valid runs are aggregated and
+    days without any are filled in as NaN afterwards, instead of resampling
+    across outages and masked spans; the result is the same.
+
+    Args:
+        agg: Hourly aggregates from load_data()
+        coverage: Optional coverage index from build_coverage_index()
+
     Returns:
         DataFrame with daily mean temperatures
     """
     print('\nComputing daily averages...')
-    df_daily = df[TEMP_VARS].resample('D').mean()
+    if coverage is None:
+        daily = resample_aggregates(agg, 'D')
+    else:
+        days = pd.date_range(agg.index[0].floor('D'), agg.index[-1].floor('D'), freq='D',
+                             name=agg.index.name)
+        kept = agg[valid_hours(coverage, agg.index)]
+        daily = combine_aggregates(kept, lambda frame: frame.groupby(frame.index.floor('D'))).reindex(days)
+    df_daily = aggregate_means(daily)[TEMP_VARS]
 
     print(f'  {len(df_daily)} daily observations')
     return df_daily
 
 
-def characterize_channels(df_daily: pd.DataFrame) -> pd.DataFrame:
+def channel_sample_stats(agg: pd.DataFrame) -> pd.DataFrame:
+    """Whole-record sample statistics per channel from hourly aggregates.
+
+    Args:
+        agg: Hourly (or coarser) aggregates
+
+    Returns:
+        DataFrame indexed by variable with n_samples, sample_mean,
+        sample_std (ddof=1), sample_min and sample_max
+    """
+    n = agg['count'].sum()
+    total = agg['sum'].sum()
+    mean = total / n.where(n > 0)
+    var = (agg['sumsq'].sum() - total * mean) / (n - 1).where(n > 1)
+    return pd.DataFrame({
+        'n_samples': n,
+        'sample_mean': mean,
+        'sample_std': np.sqrt(var.clip(lower=0)),
+        'sample_min': agg['min'].min(),
+        'sample_max': agg['max'].max(),
+    })
+
+
+def build_pyramid(agg: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Build the PYRAMID_LEVELS aggregates from hourly aggregates in one pass.
+
+    Each level is merged from a finer one, and bins are left-closed and
+    labelled by their start (weeks start on Monday). Bins without samples
+    or QC flags are dropped, counts are stored as uint32 and min/max as
+    float32.
+
+    Args:
+        agg: Hourly aggregates (after QC masking)
+
+    Returns:
+        Dict mapping level name to its aggregate DataFrame
+    """
+    pyramid = {}
+    for level, (rule, source) in PYRAMID_LEVELS.items():
+        pyramid[level] = agg if source is None else combine_aggregates(
+            pyramid[source], lambda frame: frame.resample(rule, closed='left', label='left'))
+
+    for level, level_agg in pyramid.items():
+        occupied = (level_agg['count'].sum(axis=1) > 0) | (level_agg[AGG_FLAG_STATS].sum(axis=1) > 0)
+        pyramid[level] = level_agg[occupied].astype(
+            {col: np.uint32 if col[0] == 'count' or col[0] in AGG_FLAG_STATS
+             else np.float32 if col[0] in ('min', 'max') else np.float64
+             for col in level_agg.columns})
+    return pyramid
+
+
+def pyramid_blocks(pyramid: dict[str, pd.DataFrame],
+                   start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Fewest pyramid bins that exactly tile the half-open range [start, end).
+
+    Working from the coarsest level down, every bin lying wholly inside a
+    still-uncovered span is taken, and the leftover edges are passed to the
+    next finer level. Hours are the finest level, so the range is resolved
+    to the hours that start inside it.
+
+    Returns:
+        Aggregate rows of the selected bins (from mixed levels)
+    """
+    spans = [(np.datetime64(start, 'ns'), np.datetime64(end, 'ns'))]
+    blocks = []
+    for level in reversed(PYRAMID_LEVELS):
+        level_agg = pyramid[level]
+        labels = level_agg.index.values
+        if PYRAMID_LEVELS[level][1] is None:
+            rows = [np.arange(np.searchsorted(labels, lo), np.searchsorted(labels, hi)) for lo, hi in spans]
+            blocks.append(level_agg.iloc[np.concatenate(rows)])
+            break
+
+        ends = (level_agg.index + pd.tseries.frequencies.to_offset(PYRAMID_LEVELS[level][0])).values
+        rows, remaining = [], []
+        for lo, hi in spans:
+            i, j = np.searchsorted(labels, lo), np.searchsorted(ends, hi, side='right')
+            if i < j:
+                rows.append(np.arange(i, j))
+                remaining += [(lo, labels[i]), (ends[j - 1], hi)]
+            else:
+                remaining.append((lo, hi))
+        if rows:
+            blocks.append(level_agg.iloc[np.concatenate(rows)])
+        spans = [(lo, hi) for lo, hi in remaining if lo < hi]
+    return pd.concat(blocks)
+
+
+def pyramid_stats(start: str | pd.Timestamp, end: str | pd.Timestamp,
+                  pyramid: dict[str, pd.DataFrame] | None = None) -> pd.DataFrame:
+    """Per-channel sample statistics for a time range from the pyramid.
+
+    Combines a handful of precomputed bins instead of rereading the hourly
+    data, e.g. pyramid_stats('2015-01-01', '2015-04-23') for the months
+    before the 2015 eruption.
+
+    Args:
+        start: Range start (inclusive)
+        end: Range end (inclusive; a date string covers the whole day)
+        pyramid: Pyramid from build_pyramid() or load_pyramid() (loaded
+            from PYRAMID_DIR if omitted)
+
+    Returns:
+        DataFrame indexed by variable, as channel_sample_stats()
+    """
+    start, end = time_window(str(start), str(end))
+    pyramid = pyramid if pyramid is not None else load_pyramid()
+    return channel_sample_stats(pyramid_blocks(pyramid, start, end + pd.Timedelta(1, 'ns')))
+
+
+def characterize_channels(df_daily: pd.DataFrame,
+                          agg: pd.DataFrame | None = None) -> pd.DataFrame:
     """Compute per-channel statistics and characterization.
 
     Calculates mean, std, min, max, range, and coefficient of variation
@@ -305,6 +2324,8 @@ def characterize_channels(df_daily: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df_daily: DataFrame with daily mean temperatures
+        agg: Optional hourly aggregates; adds whole-record sample statistics
+            (see channel_sample_stats()) without rescanning the data
 
     Returns:
         DataFrame with channel statistics, sorted by mean temperature
@@ -336,6 +2357,29 @@ def characterize_channels(df_daily: pd.DataFrame) -> pd.DataFrame:
         })
 
     df_stats = pd.DataFrame(stats)
+    if agg is not None:
+        df_stats = df_stats.join(channel_sample_stats(agg), on='variable')
+    df_stats = classify_channels(df_stats)
+
+    print(f'  Channel temperature range: {df_stats["mean"].min():.2f}C to {df_stats["mean"].max():.2f}C')
+    print(f'  Hot channels (above median): {(df_stats["regime"] == "hot").sum()}')
+    print(f'  Cool channels (below median): {(df_stats["regime"] == "cool").sum()}')
+    print(f'  Most variable channel: temperature{df_stats.loc[df_stats["variability_rank"] == 1, "channel"].values[0]:02d}')
+
+    return df_stats
+
+
+def classify_channels(df_stats: pd.DataFrame) -> pd.DataFrame:
+    """Add regime and rank columns to per-channel statistics.
+
+    Args:
+        df_stats: One row per channel with 'mean' and 'cv_percent' columns
+
+    Returns:
+        DataFrame with regime, temp_rank and variability_rank columns,
+        sorted by mean temperature
+    """
+    df_stats = df_stats.copy()
 
     # Classify channels by temperature regime
     median_mean = df_stats['mean'].median()
@@ -352,14 +2396,7 @@ def characterize_channels(df_daily: pd.DataFrame) -> pd.DataFrame:
     ).astype(int)
 
     # Sort by mean temperature
-    df_stats = df_stats.sort_values('mean').reset_index(drop=True)
-
-    print(f'  Channel temperature range: {df_stats["mean"].min():.2f}C to {df_stats["mean"].max():.2f}C')
-    print(f'  Hot channels (above median): {(df_stats["regime"] == "hot").sum()}')
-    print(f'  Cool channels (below median): {(df_stats["regime"] == "cool").sum()}')
-    print(f'  Most variable channel: temperature{df_stats.loc[df_stats["variability_rank"] == 1, "channel"].values[0]:02d}')
-
-    return df_stats
+    return df_stats.sort_values('mean').reset_index(drop=True)
 
 
 def get_date_range_str() -> str:
@@ -369,8 +2406,9 @@ def get_date_range_str() -> str:
     return f'{start_year}-{end_year}'
 
 
-def export_parquet(df: pd.DataFrame, df_daily: pd.DataFrame) -> None:
-    """Export cleaned data to Parquet files."""
+def export_parquet(df: pd.DataFrame, df_daily: pd.DataFrame,
+                   agg: pd.DataFrame | None = None) -> None:
+    """Export cleaned data (and optionally hourly aggregates) to Parquet files."""
     print('\nExporting data...')
     DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -386,6 +2424,151 @@ def export_parquet(df: pd.DataFrame, df_daily: pd.DataFrame) -> None:
     df_daily.to_parquet(daily_path)
     print(f'  Exported: data/{daily_path.name} ({len(df_daily)} rows)')
 
+    # Export mergeable hourly aggregates (count, sum, sumsq, min, max)
+    if agg is not None:
+        agg_path = DATA_OUTPUT_DIR / f'tmpsf_{date_range}_hourly_aggregates.parquet'
+        agg.to_parquet(agg_path)
+        print(f'  Exported: data/{agg_path.name} ({len(agg):,} rows)')
+
+
+def export_store(df: pd.DataFrame, df_daily: pd.DataFrame,
+                 qc_mask: pd.DataFrame | None = None) -> None:
+    """Export hourly and daily data as a year/month-partitioned Parquet dataset.
+
+    Temperatures are stored as float32 in time-sorted row groups with column
+    statistics, so query_store() can skip whole partitions and row groups.
+    With a QC mask, the hourly data holds the values before the hourly
+    consistency check plus the bit-packed QC_MASK_COLUMNS (four uint32
+    columns), and query_store() applies the rejection on read.
+
+    Args:
+        df: Hourly temperature data (before the consistency check if
+            qc_mask is given)
+        df_daily: Daily mean temperature data
+        qc_mask: Optional build_qc_mask() output aligned with df
+    """
+    df_hourly = store_hourly_frame(df, qc_mask)
+
+    for kind, data in (('hourly', df_hourly), ('daily', df_daily[TEMP_VARS].astype(np.float32))):
+        kind_dir = STORE_DIR / kind
+        if kind_dir.exists():
+            shutil.rmtree(kind_dir)
+        write_store(data, kind)
+        print(f'  Exported: data/{STORE_DIR.name}/{kind}/ ({len(data):,} rows, year/month partitions)')
+
+
+def store_hourly_frame(df: pd.DataFrame, qc_mask: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Hourly store columns: float32 temperatures plus the optional QC mask."""
+    df_hourly = df[TEMP_VARS].astype(np.float32)
+    if qc_mask is not None:
+        df_hourly = df_hourly.join(qc_mask[QC_MASK_COLUMNS])
+    return df_hourly
+
+
+def write_store(data: pd.DataFrame, kind: str, basename: str = 'part-{i}.parquet') -> None:
+    """Write rows into the year/month partitions of the `kind` store dataset.
+
+    Files already in the partitions are kept, so a new `basename` appends
+    rows to the dataset.
+    """
+    table = pa.Table.from_pandas(
+        data.sort_index().rename_axis('time').reset_index()
+        .assign(year=lambda d: d['time'].dt.year.astype(np.int16),
+                month=lambda d: d['time'].dt.month.astype(np.int8)),
+        preserve_index=False,
+    )
+    pds.write_dataset(
+        table, STORE_DIR / kind, format='parquet',
+        partitioning=pds.partitioning(
+            pa.schema([('year', pa.int16()), ('month', pa.int8())]), flavor='hive'),
+        file_options=pds.ParquetFileFormat().make_write_options(
+            compression='zstd', write_statistics=True),
+        max_rows_per_group=STORE_ROW_GROUP_ROWS[kind],
+        min_rows_per_group=STORE_ROW_GROUP_ROWS[kind],
+        basename_template=basename,
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+
+def query_store(start: str | pd.Timestamp, end: str | pd.Timestamp,
+                channels: list[str] | None = None, kind: str = 'hourly',
+                store_dir: Path | None = None,
+                reject: list[str] | None = None) -> pd.DataFrame:
+    """Read a time range and channel subset from the partitioned store.
+
+    Only partitions for the months overlapping the range are opened, and row
+    groups outside it are skipped using their time statistics.
+
+    Args:
+        start: Range start (inclusive)
+        end: Range end (inclusive; a date string covers the whole day)
+        channels: Columns to read, e.g. ['temperature01', 'qc_consistency']
+            (defaults to all 24 temperature channels)
+        kind: 'hourly' or 'daily'
+        store_dir: Store location (defaults to STORE_DIR)
+        reject: QC_MASK_COLUMNS whose flagged values are set to NaN (see
+            apply_qc_mask(); defaults to QC_DEFAULT_REJECT, [] for none)
+
+    Returns:
+        DataFrame indexed by time
+    """
+    start, end = time_window(str(start), str(end))
+    channels = channels or TEMP_VARS
+    dataset = pds.dataset((store_dir or STORE_DIR) / kind, format='parquet', partitioning='hive')
+
+    year, month, time = pds.field('year'), pds.field('month'), pds.field('time')
+    in_months = (
+        (year >= start.year) & (year <= end.year)
+        & ((year > start.year) | (month >= start.month))
+        & ((year < end.year) | (month <= end.month))
+    )
+    in_range = (time >= pa.scalar(start, pa.timestamp('ns'))) & (time <= pa.scalar(end, pa.timestamp('ns')))
+
+    # Read the QC mask columns needed to rebuild the requested variant
+    reject = QC_DEFAULT_REJECT if reject is None else reject
+    qc_columns = [c for c in reject if c in dataset.schema.names and c not in channels]
+    table = dataset.to_table(columns=['time'] + list(channels) + qc_columns,
+                             filter=in_months & in_range)
+    df = table.to_pandas().set_index('time').sort_index()
+    if any(c in dataset.schema.names for c in reject):
+        df = apply_qc_mask(df, df, [c for c in reject if c in dataset.schema.names])
+    return df.drop(columns=qc_columns)
+
+
+def export_events(df_changes: pd.DataFrame, df_events: pd.DataFrame) -> None:
+    """Export per-channel change points and multi-channel events to CSV."""
+    DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    for name, frame in (('changepoints.csv', df_changes), ('events.csv', df_events)):
+        frame.to_csv(DATA_OUTPUT_DIR / name, index=False, float_format='%.3f')
+        print(f'  Exported: data/{name} ({len(frame)} rows)')
+
+
+def export_coverage(coverage: pd.DataFrame) -> None:
+    """Export the run-length coverage index to COVERAGE_PATH."""
+    COVERAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    coverage.to_parquet(COVERAGE_PATH, index=False)
+    print(f'  Exported: data/{COVERAGE_PATH.name} ({len(coverage):,} runs)')
+
+
+def load_coverage_index(path: Path | None = None) -> pd.DataFrame:
+    """Read the coverage index written by export_coverage()."""
+    return pd.read_parquet(path or COVERAGE_PATH)
+
+
+def export_pyramid(pyramid: dict[str, pd.DataFrame]) -> None:
+    """Export each pyramid level to PYRAMID_DIR/<level>.parquet."""
+    PYRAMID_DIR.mkdir(parents=True, exist_ok=True)
+    for level, level_agg in pyramid.items():
+        level_agg.to_parquet(PYRAMID_DIR / f'{level}.parquet')
+    print(f'  Exported: data/{PYRAMID_DIR.name}/ '
+          f'({", ".join(f"{len(a):,} {level}" for level, a in pyramid.items())} bins)')
+
+
+def load_pyramid(pyramid_dir: Path | None = None) -> dict[str, pd.DataFrame]:
+    """Read the aggregate pyramid written by export_pyramid()."""
+    pyramid_dir = pyramid_dir or PYRAMID_DIR
+    return {level: pd.read_parquet(pyramid_dir / f'{level}.parquet') for level in PYRAMID_LEVELS}
+
 
 def export_channel_stats(df_stats: pd.DataFrame) -> None:
     """Export channel statistics to CSV."""
@@ -396,6 +2579,134 @@ def export_channel_stats(df_stats: pd.DataFrame) -> None:
     print(f'  Exported: data/{stats_path.name}')
 
 
+def export_consistency_sweep(deviation: pd.DataFrame) -> pd.DataFrame:
+    """Export consistency deviations and flagged counts per candidate threshold.
+
+    The float32 deviation file lets the effect of other thresholds be
+    explored without reloading the NetCDF data; to apply one, rerun
+    apply_cross_channel_consistency(df, threshold), which decides in
+    float64.
+
+    Returns:
+        Sweep table from sweep_consistency_thresholds()
+    """
+    DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    deviation_path = DATA_OUTPUT_DIR / f'tmpsf_{get_date_range_str()}_consistency_deviation.parquet'
+    deviation.to_parquet(deviation_path)
+    print(f'  Exported: data/{deviation_path.name}')
+
+    df_sweep = sweep_consistency_thresholds(deviation, CONSISTENCY_SWEEP_THRESHOLDS)
+    sweep_path = DATA_OUTPUT_DIR / 'consistency_sweep.csv'
+    df_sweep.to_csv(sweep_path)
+    print(f'  Exported: data/{sweep_path.name}')
+
+    total = sum(deviation[TEMP_VARS].notna().sum())
+    print('  Consistency threshold sweep (values flagged):')
+    for threshold, n_flagged in df_sweep['total'].items():
+        print(f'    {threshold:5.1f}C: {n_flagged:,} ({n_flagged / total * 100 if total else 0:.3f}%)')
+    return df_sweep
+
+
+def figure_style(plot):
+    """Decorate a plot function to draw with PLOT_STYLE.
+
+    The style is applied with an rc_context around the call, so global
+    matplotlib settings (e.g. in a notebook) are left alone.
+    """
+    @functools.wraps(plot)
+    def styled(*args, **kwargs):
+        import matplotlib
+
+        with matplotlib.rc_context(PLOT_STYLE):
+            return plot(*args, **kwargs)
+    return styled
+
+
+def figure_width_pixels(fig) -> int:
+    """Width of a figure in pixels at the savefig resolution."""
+    import matplotlib
+
+    return int(fig.get_figwidth() * matplotlib.rcParams['savefig.dpi'])
+
+
+def decimate_minmax(times: np.ndarray, values: np.ndarray,
+                    n_pixels: int) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a timeseries to the min and max point of each pixel column.
+
+    The time axis is split into `n_pixels` equal bins and only the minimum
+    and maximum sample of each bin are kept, in time order, so the plotted
+    line has the same envelope as the full series while plotting cost
+    depends on figure width rather than data length. Bins with no data
+    become NaN breaks, so gaps still show.
+
+    Args:
+        times: datetime64 sample times, sorted
+        values: Values, NaN for missing
+        n_pixels: Number of horizontal pixels (bins)
+
+    Returns:
+        Tuple of (times, values) to plot; the input if already short enough
+    """
+    if len(values) <= 2 * n_pixels:
+        return times, values
+
+    t_ns = times.astype('datetime64[ns]').astype(np.int64)
+    bins = ((t_ns - t_ns[0]) / (t_ns[-1] - t_ns[0] + 1) * n_pixels).astype(np.int64)
+
+    idx = np.flatnonzero(~np.isnan(values))
+    if idx.size == 0:
+        return times[:1], values[:1]
+
+    # Sort valid samples by (bin, value): the first and last of each bin
+    # are its min and max
+    order = idx[np.lexsort((values[idx], bins[idx]))]
+    sorted_bins = bins[order]
+    new_bin = np.r_[True, sorted_bins[1:] != sorted_bins[:-1]]
+    end_bin = np.r_[sorted_bins[1:] != sorted_bins[:-1], True]
+    keep = np.union1d(order[new_bin], order[end_bin])
+
+    # Break the line across empty bins
+    gaps = np.flatnonzero(np.diff(bins[keep]) > 1) + 1
+    out_times = np.insert(times[keep], gaps, times[keep][gaps - 1])
+    out_values = np.insert(values[keep].astype(float), gaps, np.nan)
+    return out_times, out_values
+
+
+def render_figures(df_daily: pd.DataFrame, df_stats: pd.DataFrame,
+                   n_workers: int | None = None, coverage: pd.DataFrame | None = None) -> None:
+    """Render the publication figures, concurrently if n_workers > 1.
+
+    Each figure is drawn in its own worker process, so total rendering time
+    is that of the slowest figure rather than the sum.
+
+    Args:
+        df_daily: DataFrame with daily mean temperatures
+        df_stats: Channel statistics from characterize_channels()
+        n_workers: Number of worker processes (defaults to PLOT_WORKERS)
+        coverage: Coverage index; adds the channel coverage figure
+    """
+    n_workers = n_workers if n_workers is not None else PLOT_WORKERS
+    jobs = [
+        (plot_all_channels, (df_daily, df_stats)),
+        (plot_channel_stats, (df_stats,)),
+        (plot_hot_vs_cool, (df_daily, df_stats)),
+    ]
+    if coverage is not None:
+        jobs.append((plot_coverage, (coverage,)))
+
+    if n_workers > 1:
+        print(f'\nRendering {len(jobs)} figures in {min(n_workers, len(jobs))} worker processes...')
+        with worker_pool(min(n_workers, len(jobs))) as pool:
+            futures = [pool.submit(func, *args) for func, args in jobs]
+            for future in futures:
+                future.result()
+    else:
+        for func, args in jobs:
+            func(*args)
+
+
+@figure_style
 def plot_all_channels(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     """Create full timeseries overview with all 24 channels.
 
@@ -403,8 +2714,10 @@ def plot_all_channels(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     """
     print('\nGenerating full timeseries plot...')
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(6, 3))
+    n_pixels = figure_width_pixels(fig)
 
     # Create colormap based on mean temperature
     temp_means = df_stats.set_index('variable')['mean']
@@ -413,7 +2726,8 @@ def plot_all_channels(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
 
     for var in TEMP_VARS:
         color = cmap(norm(temp_means[var]))
-        ax.plot(df_daily.index, df_daily[var], color=color, alpha=0.7, linewidth=0.5)
+        ax.plot(*decimate_minmax(df_daily.index.values, df_daily[var].values, n_pixels),
+                color=color, alpha=0.7, linewidth=0.5)
 
     # Add colorbar
     sm = plt.cm.ScalarMappable(cmap=cmap, norm=norm)
@@ -438,10 +2752,12 @@ def plot_all_channels(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     print(f'  Saved: figures/{output_path.name}')
 
 
+@figure_style
 def plot_channel_stats(df_stats: pd.DataFrame) -> None:
     """Create bar chart of mean temperatures by channel with error bars."""
     print('Generating channel characterization plot...')
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(6, 3))
 
@@ -480,10 +2796,54 @@ def plot_channel_stats(df_stats: pd.DataFrame) -> None:
     print(f'  Saved: figures/{output_path.name}')
 
 
+@figure_style
+def plot_coverage(coverage: pd.DataFrame) -> None:
+    """Create a per-channel timeline of valid data, outages and QC removals."""
+    print('Generating channel coverage plot...')
+    FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    fig, ax = plt.subplots(figsize=(7.5, 4))
+    colors = {'valid': '#4d9221', 'no_data': '#bababa', 'qartod': '#d6604d',
+              'consistency': '#f4a582'}
+    starts = mdates.date2num(coverage['start'])
+    widths = coverage['n_hours'].to_numpy() / 24
+    for state, color in colors.items():
+        runs = (coverage['state'] == state).to_numpy()
+        for channel in np.unique(coverage['channel'][runs]):
+            sel = runs & (coverage['channel'] == channel).to_numpy()
+            ax.broken_barh(list(zip(starts[sel], widths[sel])), (channel - 0.4, 0.8),
+                           facecolors=color, linewidth=0)
+
+    ax.set_yticks(range(1, len(TEMP_VARS) + 1))
+    ax.set_yticklabels([f'{c:02d}' for c in range(1, len(TEMP_VARS) + 1)], fontsize=6)
+    ax.set_ylim(len(TEMP_VARS) + 0.6, 0.4)
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    ax.set_ylabel('Channel Number')
+    ax.set_title('Hourly Data Coverage by Channel')
+
+    from matplotlib.patches import Patch
+    labels = {'valid': 'Valid', 'no_data': 'No data', 'qartod': 'QARTOD rejected',
+              'consistency': 'Consistency rejected'}
+    ax.legend(handles=[Patch(facecolor=colors[s], label=labels[s]) for s in colors],
+              loc='upper center', bbox_to_anchor=(0.5, -0.14), ncol=4, fontsize=8, frameon=False)
+
+    plt.tight_layout()
+    output_path = FIGURES_DIR / 'channel_coverage.png'
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f'  Saved: figures/{output_path.name}')
+
+
+@figure_style
 def plot_hot_vs_cool(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     """Create overlay of hottest 3 and coolest 3 channels."""
     print('Generating hot vs cool comparison plot...')
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+    import matplotlib.pyplot as plt
 
     # Get top 3 hottest and coolest
     df_sorted = df_stats.sort_values('mean')
@@ -491,19 +2851,22 @@ def plot_hot_vs_cool(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     hottest_3 = df_sorted.tail(3)['variable'].tolist()
 
     fig, ax = plt.subplots(figsize=(6, 3))
+    n_pixels = figure_width_pixels(fig)
 
     # Plot cool channels in blue shades
     cool_colors = ['#4393c3', '#2166ac', '#053061']
     for i, var in enumerate(coolest_3):
         channel = int(var.replace('temperature', ''))
-        ax.plot(df_daily.index, df_daily[var], color=cool_colors[i],
+        ax.plot(*decimate_minmax(df_daily.index.values, df_daily[var].values, n_pixels),
+                color=cool_colors[i],
                 alpha=0.8, linewidth=0.8, label=f'Ch {channel:02d} (cool)')
 
     # Plot hot channels in red shades
     hot_colors = ['#d6604d', '#b2182b', '#67001f']
     for i, var in enumerate(hottest_3):
         channel = int(var.replace('temperature', ''))
-        ax.plot(df_daily.index, df_daily[var], color=hot_colors[i],
+        ax.plot(*decimate_minmax(df_daily.index.values, df_daily[var].values, n_pixels),
+                color=hot_colors[i],
                 alpha=0.8, linewidth=0.8, label=f'Ch {channel:02d} (hot)')
 
     ax.set_xlabel('Date')
@@ -545,41 +2908,583 @@ def print_summary(df_daily: pd.DataFrame, df_stats: pd.DataFrame) -> None:
     print(f'  Hottest channel: temperature{df_stats.iloc[-1]["channel"]:02.0f} ({df_stats.iloc[-1]["mean"]:.2f}C)')
 
 
-def main():
-    """Run the full analysis pipeline."""
-    # Load data with QARTOD QC filtering
-    df, qc_counts = load_data()
+def online_stats_merge(stats: dict, batch: dict) -> dict:
+    """Combine two sets of running per-channel statistics (Chan et al.).
+
+    Each set holds arrays 'count', 'mean', 'm2' (sum of squared deviations
+    from the mean), 'min' and 'max'. This is the batch form of Welford's
+    update, so the cost depends only on the size of the batch.
+    """
+    count = stats['count'] + batch['count']
+    delta = batch['mean'] - stats['mean']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(count > 0, batch['count'] / count, 0.0)
+        mean = np.where(stats['count'] > 0, stats['mean'] + delta * weight, batch['mean'])
+        m2 = np.where(stats['count'] > 0,
+                      stats['m2'] + batch['m2'] + delta**2 * stats['count'] * weight,
+                      batch['m2'])
+    mean = np.where(batch['count'] > 0, mean, stats['mean'])
+    m2 = np.where(batch['count'] > 0, m2, stats['m2'])
+    return {'count': count, 'mean': mean, 'm2': m2,
+            'min': np.fmin(stats['min'], batch['min']),
+            'max': np.fmax(stats['max'], batch['max'])}
+
+
+def aggregate_moments(agg: pd.DataFrame) -> dict:
+    """Per-channel count, mean, m2, min and max of the samples in `agg`.
+
+    The sum of squared deviations is accumulated hour by hour around each
+    hour's mean and then combined, which keeps it well conditioned.
+    """
+    counts = agg['count'][TEMP_VARS].to_numpy()
+    sums = agg['sum'][TEMP_VARS].to_numpy()
+    count = counts.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hour_mean = sums / counts
+        mean = sums.sum(axis=0) / count
+        within = np.where(counts > 0, agg['sumsq'][TEMP_VARS].to_numpy() - sums * hour_mean, 0.0)
+        between = np.where(counts > 0, counts * (hour_mean - mean)**2, 0.0)
+    return {'count': count, 'mean': mean,
+            'm2': np.clip(within, 0, None).sum(axis=0) + between.sum(axis=0),
+            'min': agg['min'][TEMP_VARS].min().to_numpy(),
+            'max': agg['max'][TEMP_VARS].max().to_numpy()}
+
+
+def value_moments(values: np.ndarray) -> dict:
+    """Per-channel count, mean, m2, min and max of a (rows, channels) array, skipping NaN."""
+    count = np.isfinite(values).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(values, axis=0) / count
+        m2 = np.nansum((values - mean)**2, axis=0)
+        extremes = np.where(np.isfinite(values), values, np.nan)
+    return {'count': count, 'mean': mean, 'm2': m2,
+            'min': np.fmin.reduce(extremes, axis=0), 'max': np.fmax.reduce(extremes, axis=0)}
+
+
+def empty_moments() -> dict:
+    """Running statistics with no observations, for online_stats_merge()."""
+    n = len(TEMP_VARS)
+    return {'count': np.zeros(n, dtype=np.int64), 'mean': np.full(n, np.nan),
+            'm2': np.zeros(n), 'min': np.full(n, np.nan), 'max': np.full(n, np.nan)}
+
+
+def fold_daily_means(state: dict, agg: pd.DataFrame) -> None:
+    """Fold QC'd hourly aggregates into the state's daily-mean statistics.
+
+    Daily means are sample-weighted, as in compute_daily_mean(). Every day
+    before the newest one is complete and its means are merged into
+    state['daily']; the newest day's per-channel count and sum stay in
+    state['open_day'] until a later day arrives.
+    """
+    daily = combine_aggregates(agg, lambda frame: frame.groupby(frame.index.floor('D')))
+    counts, sums = daily['count'][TEMP_VARS], daily['sum'][TEMP_VARS]
+    open_day = state['open_day']
+    if open_day is not None:
+        day = pd.Timestamp(open_day['day'])
+        counts = counts.add(pd.DataFrame([open_day['count']], index=[day], columns=TEMP_VARS), fill_value=0)
+        sums = sums.add(pd.DataFrame([open_day['sum']], index=[day], columns=TEMP_VARS), fill_value=0)
+
+    newest = counts.index.max()
+    done = counts.index < newest
+    if done.any():
+        means = (sums[done] / counts[done].where(counts[done] > 0)).to_numpy(np.float64)
+        state['daily'] = online_stats_merge(state['daily'], value_moments(means))
+    state['open_day'] = {'day': newest.isoformat(),
+                         'count': counts.loc[newest].to_numpy(np.int64).tolist(),
+                         'sum': sums.loc[newest].to_numpy(np.float64).tolist()}
+
+
+def stream_channel_stats(state: dict) -> pd.DataFrame:
+    """Channel statistics, regime and ranks from the running stream state.
+
+    Same columns and definitions as characterize_channels(df_daily, agg):
+    mean, std, min, max, range, cv_percent and n_obs are taken over daily
+    means (the open day counts with its mean so far) and the n_samples and
+    sample_* columns over all samples, so the live table matches the batch
+    one for the same data.
+    """
+    stats = state['daily']
+    if state['open_day'] is not None:
+        count, total = np.array(state['open_day']['count']), np.array(state['open_day']['sum'])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            day_mean = np.where(count > 0, total / count, np.nan)
+        stats = online_stats_merge(stats, value_moments(day_mean[np.newaxis, :]))
+
+    n = stats['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(stats['m2'] / np.where(n > 1, n - 1, np.nan))
+    samples = state['samples']
+    n_samples = samples['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sample_std = np.sqrt(samples['m2'] / np.where(n_samples > 1, n_samples - 1, np.nan))
+    df_stats = pd.DataFrame({
+        'channel': np.arange(1, len(TEMP_VARS) + 1),
+        'variable': TEMP_VARS,
+        'mean': stats['mean'],
+        'std': std,
+        'min': stats['min'],
+        'max': stats['max'],
+        'range': stats['max'] - stats['min'],
+        'cv_percent': np.where(stats['mean'] > 0, std / stats['mean'] * 100, np.nan),
+        'n_obs': n,
+        'n_samples': n_samples,
+        'sample_mean': samples['mean'],
+        'sample_std': sample_std,
+        'sample_min': samples['min'],
+        'sample_max': samples['max'],
+    })
+    return classify_channels(df_stats)
+
+
+def load_stream_state() -> dict:
+    """Load the streaming state, or start an empty one.
+
+    The state holds the files already ingested, the last sample time (the
+    overlap cutoff for the next file), running sample and daily-mean
+    statistics, the newest day's partial sums, QC counts and the aggregates
+    of the newest, possibly incomplete hour.
+    """
+    state = {
+        'files': {},
+        'last_time': None,
+        'samples': empty_moments(),
+        'daily': empty_moments(),
+        'open_day': None,
+        'qc_counts': {var: {'total': 0, 'passed': 0, 'failed': 0} for var in TEMP_VARS},
+        'pending': None,
+    }
+    if STREAM_STATE_PATH.exists():
+        saved = json.loads(STREAM_STATE_PATH.read_text())
+        state.update(files=saved['files'], last_time=saved['last_time'],
+                     open_day=saved['open_day'], qc_counts=saved['qc_counts'])
+        for key in ('samples', 'daily'):
+            state[key] = {k: np.array(v, dtype=np.float64 if k != 'count' else np.int64)
+                          for k, v in saved[key].items()}
+        pending_path = STREAM_STATE_PATH.with_suffix('.pending.parquet')
+        if pending_path.exists():
+            state['pending'] = pd.read_parquet(pending_path)
+    return state
+
+
+def seed_stream_state(state: dict, directory: Path) -> None:
+    """Start a new stream from the outputs of an earlier batch run.
+
+    The batch hourly aggregates (from export_parquet()) seed the running
+    statistics, and the end of their last hour becomes the overlap cutoff,
+    so hours already in the store are not appended again. Files whose
+    cataloged coverage ends by then count as ingested and are not reread.
+    QC counts only cover files streamed afterwards.
+    """
+    agg_path = DATA_OUTPUT_DIR / f'tmpsf_{get_date_range_str()}_hourly_aggregates.parquet'
+    if not agg_path.exists():
+        return
+    agg = pd.read_parquet(agg_path)
+    if agg.empty:
+        return
+
+    state['samples'] = aggregate_moments(agg)
+    fold_daily_means(state, agg)
+    last_time = agg.index.max() + pd.Timedelta(hours=1) - pd.Timedelta(1, 'ns')
+    state['last_time'] = last_time.isoformat()
+    df_catalog = load_catalog(sorted(directory.glob('*.nc')))
+    for f in df_catalog.loc[df_catalog['end'] <= last_time, 'path']:
+        state['files'][f.name] = file_identity(f)
+    print(f'  Seeded from data/{agg_path.name} ({len(agg):,} hours up to {last_time:%Y-%m-%d %H:%M}, '
+          f'{len(state["files"])} files covered)')
+
+
+def save_stream_state(state: dict) -> None:
+    """Write the streaming state next to the other outputs."""
+    STREAM_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    pending_path = STREAM_STATE_PATH.with_suffix('.pending.parquet')
+    if state['pending'] is not None:
+        state['pending'].to_parquet(pending_path)
+    else:
+        pending_path.unlink(missing_ok=True)
+    STREAM_STATE_PATH.write_text(json.dumps({
+        'files': state['files'],
+        'last_time': state['last_time'],
+        'open_day': state['open_day'],
+        'qc_counts': state['qc_counts'],
+        'samples': {k: v.tolist() for k, v in state['samples'].items()},
+        'daily': {k: v.tolist() for k, v in state['daily'].items()},
+    }, indent=1, default=int))
+
+
+def stored_hours(start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """Hours between start and end (inclusive) already in the hourly store."""
+    if not (STORE_DIR / 'hourly').exists():
+        return pd.DatetimeIndex([], name='time')
+    return query_store(start, end, channels=TEMP_VARS[:1], reject=[]).index
+
+
+def stream_update(state: dict, files: list[Path], reader: str | None = None) -> int:
+    """Ingest new files into the streaming state and append completed hours.
+
+    Each file goes through the batch QC steps (the file reader with no
+    window end, the hourly consistency check and the QC mask). Every hour
+    before the newest one is complete: it is appended to the hourly store
+    (unless already stored) and folded into the running statistics. The
+    newest hour stays pending until later data arrives. Files are recorded
+    as ingested only once their data has been merged.
+
+    A file that cannot be read (e.g. one still being copied in) stops the
+    update there: it and every later file are left for the next poll, so
+    the filename-order overlap cutoff stays the same.
+
+    Returns:
+        Number of hours appended
+    """
+    window = (time_window()[0], None)
+    aggs = [] if state['pending'] is None else [state['pending']]
+    last_time = state['last_time']
+    ingested = []
+    for f in files:
+        after = None if last_time is None else np.datetime64(last_time, 'ns')
+        try:
+            arrays = READERS[reader or READER](f, after, window)
+        except (OSError, ValueError) as exc:
+            print(f'  WARNING: could not read {f.name} ({exc}); retrying it and '
+                  f'{len(files) - len(ingested) - 1} later files next poll')
+            break
+        ingested.append(f)
+        if arrays is not None:
+            agg, file_counts = aggregate_file_arrays(*arrays)
+            merge_qc_counts(state['qc_counts'], file_counts)
+            aggs.append(agg)
+            last_time = pd.Timestamp(arrays[0].max()).isoformat()
+        print(f'  Read {f.name}')
+
+    n_hours = 0
+    if aggs:
+        agg = merge_aggregates(aggs)
+        newest = agg.index.max()
+        complete, state['pending'] = agg[agg.index < newest], agg[agg.index >= newest]
+        if not complete.empty:
+            n_hours = append_stream_hours(state, complete)
+
+    state['last_time'] = last_time
+    for f in ingested:
+        state['files'][f.name] = file_identity(f)
+    return n_hours
+
+
+def append_stream_hours(state: dict, complete: pd.DataFrame) -> int:
+    """QC completed hours, append them to the hourly store and update the statistics.
+
+    Returns:
+        Number of hours appended
+    """
+    df_qartod = hourly_means(complete)
+    df, _ = apply_cross_channel_consistency(df_qartod)
+    flags = df_qartod[TEMP_VARS].notna() & df[TEMP_VARS].isna()
+    qc_mask = build_qc_mask(complete, df_qartod.index, flags)
+    complete = mask_aggregates(complete, flags)
+
+    df_store = store_hourly_frame(df_qartod, qc_mask)
+    df_store = df_store[~df_store.index.isin(stored_hours(df_store.index[0], df_store.index[-1]))]
+    if not df_store.empty:
+        tag = f'stream-{pd.Timestamp(df_store.index[0]):%Y%m%dT%H%M%S}'
+        write_store(df_store, 'hourly', basename=tag + '-{i}.parquet')
+    state['samples'] = online_stats_merge(state['samples'], aggregate_moments(complete))
+    fold_daily_means(state, complete)
+    return len(df_store)
+
+
+def watch(directory: Path | None = None, poll_seconds: float | None = None,
+          max_polls: int | None = None, reader: str | None = None) -> pd.DataFrame | None:
+    """Streaming mode: poll a directory and update outputs as files arrive.
+
+    New NetCDF files (by name, in filename order) are ingested as in
+    stream_update(); the running channel statistics, regime and ranks are
+    written to STREAM_STATS_PATH after every update. Work per poll depends
+    only on the new files. State persists in STREAM_STATE_PATH, so watching
+    can be stopped and resumed; a new stream continues from the batch
+    outputs if there are any (see seed_stream_state()).
+
+    Args:
+        directory: Directory to watch (defaults to DATA_DIR)
+        poll_seconds: Seconds between polls (defaults to STREAM_POLL_SECONDS)
+        max_polls: Stop after this many polls (default: run until interrupted)
+        reader: Reader backend in READERS (defaults to READER)
+
+    Returns:
+        The latest live channel statistics, or None if nothing was ingested
+    """
+    directory = directory or DATA_DIR
+    poll_seconds = STREAM_POLL_SECONDS if poll_seconds is None else poll_seconds
+    new_stream = not STREAM_STATE_PATH.exists()
+    state = load_stream_state()
+    if new_stream:
+        seed_stream_state(state, directory)
+        save_stream_state(state)
+    df_stats = stream_channel_stats(state) if state['samples']['count'].sum() else None
+    print(f'Watching {directory} every {poll_seconds:g} s '
+          f'({len(state["files"])} files already ingested)')
+
+    n_polls = 0
+    try:
+        while max_polls is None or n_polls < max_polls:
+            if n_polls:
+                time.sleep(poll_seconds)
+            n_polls += 1
+            new_files = [f for f in sorted(directory.glob('*.nc')) if f.name not in state['files']]
+            if not new_files:
+                continue
+
+            print(f'\n[{datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S}Z] {len(new_files)} new files')
+            try:
+                n_hours = stream_update(state, new_files, reader)
+            except Exception as exc:
+                # Drop the partial update and keep watching from the saved state
+                print(f'  ERROR: update failed ({type(exc).__name__}: {exc}); retrying next poll')
+                state = load_stream_state()
+                continue
+            save_stream_state(state)
+            if state['samples']['count'].sum() == 0:
+                continue
+
+            df_stats = stream_channel_stats(state)
+            df_stats.to_csv(STREAM_STATS_PATH, index=False, float_format='%.3f')
+            print(f'  Appended {n_hours} hours; {int(state["samples"]["count"].sum()):,} samples in '
+                  f'running stats; hottest channel: '
+                  f'temperature{df_stats.iloc[-1]["channel"]:02.0f} ({df_stats.iloc[-1]["mean"]:.2f}C)')
+    except KeyboardInterrupt:
+        print('\nStopped watching')
+    return df_stats
+
+
+def run_hourly_qc(agg: pd.DataFrame, qc_counts: dict) -> tuple:
+    """Report QARTOD counts and run the hourly cross-channel consistency check.
+
+    Returns:
+        Tuple of (QC'd hourly means, pre-consistency hourly means for the
+        store, aggregates with rejected cells masked, QC provenance mask,
+        consistency deviation frame)
+    """
+    df = hourly_means(agg)
 
     # Report QARTOD QC statistics
     report_qc_stats(qc_counts)
 
     # Apply cross-channel consistency check
-    df, consistency_stats = apply_cross_channel_consistency(df)
+    with run_stage('apply_cross_channel_consistency', rows_in=len(df)) as st:
+        df_qartod = df
+        deviation = consistency_deviation_frame(df)
+        df, consistency_stats = apply_cross_channel_consistency(df)
+        flags = df_qartod[TEMP_VARS].notna() & df[TEMP_VARS].isna()
+        qc_mask = build_qc_mask(agg, df.index, flags)
+        agg = mask_aggregates(agg, flags)
+        st['rows_out'] = len(df)
+    return df, df_qartod, agg, qc_mask, deviation
+
+
+def run_outputs(df: pd.DataFrame, df_values: pd.DataFrame, agg: pd.DataFrame,
+                qc_mask: pd.DataFrame | None,
+                deviation: pd.DataFrame | None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Validate, compute daily and channel statistics, export and plot.
 
+    Returns:
+        Tuple of (daily means, channel statistics)
+    """
     # Validate
-    validate_data(df)
+    with run_stage('validate_data', rows_in=len(df)):
+        validate_data(df)
+
+    # Detect change points and multi-channel thermal events
+    with run_stage('detect_events', rows_in=len(df)) as st:
+        df_changes, df_events = detect_events(df)
+        st['rows_out'] = len(df_changes)
+
+    # Run-length coverage and gap index
+    with run_stage('build_coverage_index', rows_in=len(qc_mask)) as st:
+        coverage = build_coverage_index(qc_mask)
+        report_coverage(coverage)
+        st['rows_out'] = len(coverage)
 
     # Compute daily stats
-    df_daily = compute_daily_mean(df)
+    with run_stage('compute_daily_mean', rows_in=len(agg)) as st:
+        df_daily = compute_daily_mean(agg, coverage)
+        st['rows_out'] = len(df_daily)
 
     # Characterize channels
-    df_stats = characterize_channels(df_daily)
+    with run_stage('characterize_channels', rows_in=len(df_daily)) as st:
+        df_stats = characterize_channels(df_daily, agg)
+        st['rows_out'] = len(df_stats)
+
+    # Build the multi-resolution aggregate pyramid
+    with run_stage('build_pyramid', rows_in=len(agg)) as st:
+        pyramid = build_pyramid(agg)
+        st['rows_out'] = sum(len(level_agg) for level_agg in pyramid.values())
 
     # Export to Parquet
-    export_parquet(df, df_daily)
-    export_channel_stats(df_stats)
+    with run_stage('export', rows_in=len(df)):
+        export_parquet(df, df_daily, agg)
+        export_pyramid(pyramid)
+        export_store(df_values, df_daily, qc_mask)
+        export_channel_stats(df_stats)
+        export_events(df_changes, df_events)
+        export_coverage(coverage)
+        if deviation is not None:
+            export_consistency_sweep(deviation)
 
     # Create publication-quality figures
-    plot_all_channels(df_daily, df_stats)
-    plot_channel_stats(df_stats)
-    plot_hot_vs_cool(df_daily, df_stats)
+    with run_stage('render_figures', rows_in=len(df_daily)):
+        render_figures(df_daily, df_stats, coverage=coverage)
 
     # Print summary
     print_summary(df_daily, df_stats)
+    return df_daily, df_stats
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    from fetch import FETCH_MAX_CONNECTIONS
+
+    parser = argparse.ArgumentParser(description='ASHES TMPSF temperature analysis')
+    parser.add_argument('--workers', type=int,
+                        help=f'worker processes for file ingestion (default: {N_WORKERS}), or dask '
+                             f'threads with --full-resolution (default: {FULL_RES_WORKERS})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='reuse cached per-file results; only ingest new or changed files')
+    parser.add_argument('--full-resolution', action='store_true',
+                        help='run QC at full sample rate with chunked dask execution')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'dump cProfile stats to outputs/{PROFILE_PATH.name}')
+    parser.add_argument('--reader', choices=sorted(READERS),
+                        help=f'per-file NetCDF reader backend (default: {READER})')
+    parser.add_argument('--data-dir', type=Path,
+                        help=f'directory of TMPSF NetCDF files (default: {DATA_DIR})')
+    parser.add_argument('--fetch', metavar='URL',
+                        help='first download new or changed files from the HTTP listing at URL '
+                             'into the data directory, ingesting them as they arrive')
+    parser.add_argument('--max-connections', type=int, default=FETCH_MAX_CONNECTIONS,
+                        help=f'concurrent downloads with --fetch (default: {FETCH_MAX_CONNECTIONS})')
+    parser.add_argument('--batch', type=Path, metavar='JOBS.json',
+                        help='run several jobs (data_dir, start, end, output_dir) '
+                             'on one shared worker pool')
+    parser.add_argument('--watch', nargs='?', const='', metavar='DIR',
+                        help='streaming mode: poll DIR (default: the data directory) for new files')
+    parser.add_argument('--poll-seconds', type=float, default=STREAM_POLL_SECONDS,
+                        help=f'seconds between polls in streaming mode (default: {STREAM_POLL_SECONDS})')
+    args = parser.parse_args(argv)
+
+    if args.full_resolution:
+        unsupported = (['--incremental'] if args.incremental else []) + (
+            [f'--reader {args.reader}'] if args.reader not in (None, 'xarray') else [])
+        if unsupported:
+            parser.error(f'--full-resolution reads with xarray/dask and has no cache; '
+                         f'it cannot be combined with {", ".join(unsupported)}')
+
+    # --batch and --watch run their own pipelines, which have no cache,
+    # full-resolution mode, profiling or fetch
+    for mode in ('batch', 'watch'):
+        if getattr(args, mode) is None:
+            continue
+        unsupported = [f'--{name.replace("_", "-")}' for name in
+                       ('incremental', 'full_resolution', 'profile', 'fetch', 'batch', 'watch')
+                       if name != mode and getattr(args, name) not in (None, False)]
+        if unsupported:
+            parser.error(f'--{mode} cannot be combined with {", ".join(unsupported)}')
+    return args
+
+
+def main(n_workers: int | None = None, incremental: bool = False,
+         full_resolution: bool = False, profile: bool = False, reader: str | None = None,
+         fetch_url: str | None = None, max_connections: int | None = None):
+    """Run the full analysis pipeline.
+
+    Every stage is timed and a JSON run report is written to REPORT_PATH.
+    With profile=True the whole run is also profiled with cProfile and the
+    stats are dumped to PROFILE_PATH (view with `python -m pstats` or snakeviz).
+    With fetch_url, the remote archive is first mirrored into DATA_DIR (see
+    fetch.fetch_archive()); in the default mode files are ingested while the
+    rest are still downloading. full_resolution always reads with xarray and
+    dask and bypasses the cache, so it cannot be combined with incremental
+    or another reader.
+    """
+    if full_resolution and (incremental or reader not in (None, 'xarray')):
+        raise ValueError('full_resolution reads with xarray/dask and has no cache; '
+                         f'it cannot be combined with incremental or reader={reader!r}')
+    RUN_REPORT.update(stages=[], files=[], started=datetime.now(timezone.utc).isoformat(),
+                      options={'n_workers': n_workers, 'incremental': incremental,
+                               'full_resolution': full_resolution, 'reader': reader or READER,
+                               'fetch_url': fetch_url})
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+
+    qc_mask = deviation = None
+    if fetch_url and (incremental or full_resolution):
+        from fetch import fetch_data
+
+        with run_stage('fetch') as st:
+            st['rows_out'] = len(fetch_data(fetch_url, DATA_DIR, time_window(), max_connections))
+
+    if full_resolution:
+        # QARTOD and consistency check on raw samples, then hourly means
+        with run_stage('load_data_full_resolution') as st:
+            agg, qc_counts, consistency_stats = load_data_full_resolution(n_workers=n_workers)
+            df = hourly_means(agg)
+            df_values = df
+            qc_mask = build_qc_mask(agg, df.index)
+            st['rows_out'] = len(df)
+        report_qc_stats(qc_counts)
+        print(f'\nCross-channel consistency check at full resolution '
+              f'(threshold: {CONSISTENCY_THRESHOLD}C):')
+        report_consistency_stats(consistency_stats)
+    else:
+        # Load data with QARTOD QC filtering
+        with run_stage('load_data') as st:
+            if fetch_url and not incremental:
+                agg, qc_counts = fetch_and_load(fetch_url, n_workers, reader, max_connections)
+            else:
+                agg, qc_counts = load_data(n_workers=n_workers, incremental=incremental,
+                                           reader=reader)
+            st['rows_in'] = sum(f['rows_in'] for f in RUN_REPORT['files'])
+            st['rows_out'] = len(agg)
+
+        df, df_values, agg, qc_mask, deviation = run_hourly_qc(agg, qc_counts)
+
+    df_daily, df_stats = run_outputs(df, df_values, agg, qc_mask, deviation)
+
+    if profiler:
+        profiler.disable()
+        PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(PROFILE_PATH)
+        print(f'\n  Saved profile: {PROFILE_PATH.name}')
+    write_run_report(REPORT_PATH)
 
     print('\nDone!')
     return df, df_daily, df_stats
 
 
+def run_pipeline(config: PipelineConfig | None = None, **options) -> tuple:
+    """Run the full pipeline (main()) with `config` applied.
+
+    Args:
+        config: Pipeline settings (defaults to the module defaults)
+        **options: main() options (n_workers, incremental, reader, ...)
+
+    Returns:
+        Tuple of (df, df_daily, df_stats) as returned by main()
+    """
+    with (config or PipelineConfig()).apply():
+        return main(**options)
+
+
 if __name__ == '__main__':
-    df, df_daily, df_stats = main()
+    args = parse_args()
+    config = PipelineConfig(data_dir=args.data_dir)
+    if args.watch is not None:
+        with config.apply():
+            watch(Path(args.watch) if args.watch else None, args.poll_seconds, reader=args.reader)
+        raise SystemExit
+    if args.batch is not None:
+        with config.apply():
+            run_batch(load_batch_jobs(args.batch), n_workers=args.workers, reader=args.reader)
+        raise SystemExit
+    df, df_daily, df_stats = run_pipeline(config, n_workers=args.workers, incremental=args.incremental,
+                                          full_resolution=args.full_resolution, profile=args.profile,
+                                          reader=args.reader, fetch_url=args.fetch,
+                                          max_connections=args.max_connections)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py - Pipeline stage benchmarks on synthetic TMPSF data
+
+Generates (and caches) synthetic archives at several scales, then times and
+memory-profiles each pipeline stage in analysis.py. Results are written as
+JSON and can be compared against a saved baseline run.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scales small medium] [--repeat 3]
+        [--workers 4] [--label NAME] [--baseline benchmarks/results/BASE.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import analysis  # noqa: E402
+import spectral  # noqa: E402
+from synthetic_tmpsf import write_synthetic_archive  # noqa: E402
+
+DATA_CACHE_DIR = BENCH_DIR / 'data'
+RESULTS_DIR = BENCH_DIR / 'results'
+
+# Archive parameters per scale (see write_synthetic_archive)
+SCALES = {
+    'small': {'days': 30, 'sample_seconds': 60, 'file_days': 7},
+    'medium': {'days': 365, 'sample_seconds': 60, 'file_days': 30},
+    'large': {'days': 365, 'sample_seconds': 10, 'file_days': 30},
+}
+
+
+def archive_dir(scale: str) -> Path:
+    """Return the cached synthetic archive for a scale, generating it if needed."""
+    params = SCALES[scale]
+    tag = '_'.join(f'{k}{v}' for k, v in params.items())
+    out_dir = DATA_CACHE_DIR / f'{scale}_{tag}'
+    if not any(out_dir.glob('*.nc')):
+        print(f'Generating {scale} archive in {out_dir} ...')
+        write_synthetic_archive(out_dir, start='2015-01-01', **params)
+    return out_dir
+
+
+def configure_pipeline(data_dir: Path, days: float) -> None:
+    """Point analysis.py at a synthetic archive instead of the kdata mount."""
+    analysis.DATA_DIR = data_dir
+    analysis.CATALOG_PATH = data_dir / 'file_catalog.json'
+    analysis.CACHE_DIR = data_dir / 'cache'
+    analysis.TIME_START = '2015-01-01'
+    analysis.TIME_END = str((pd.Timestamp('2015-01-01') + pd.Timedelta(days=days)).date())
+
+
+def measure(func, repeat: int) -> tuple[dict, object]:
+    """Time `func` (best of `repeat`) and measure its peak traced allocation.
+
+    Timed runs and the memory run are separate because tracemalloc slows
+    allocation-heavy code. Pipeline progress output is suppressed.
+
+    Returns:
+        Tuple of (metrics dict, result of the last call)
+    """
+    wall, cpu = [], []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0, c0 = time.perf_counter(), time.process_time()
+            result = func()
+            wall.append(time.perf_counter() - t0)
+            cpu.append(time.process_time() - c0)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'wall_s': min(wall),
+        'wall_median_s': float(np.median(wall)),
+        'cpu_s': min(cpu),
+        'peak_alloc_mb': peak / 2**20,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }, result
+
+
+def run_scale(scale: str, repeat: int, workers: int) -> list[dict]:
+    """Benchmark every pipeline stage on one synthetic archive."""
+    data_dir = archive_dir(scale)
+    configure_pipeline(data_dir, SCALES[scale]['days'])
+    n_files = len(list(data_dir.glob('*.nc')))
+    input_mb = sum(f.stat().st_size for f in data_dir.glob('*.nc')) / 2**20
+
+    stages = [('load_data', lambda: analysis.load_data(n_workers=1)),
+              ('load_data[netcdf4]', lambda: analysis.load_data(n_workers=1, reader='netcdf4'))]
+    if workers > 1:
+        stages.append((f'load_data[{workers} workers]', lambda: analysis.load_data(n_workers=workers)))
+    # All cache hits: the cost of a rerun after a downstream-only change
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis.load_data(n_workers=1, incremental=True)
+    stages.append(('load_data[cached]', lambda: analysis.load_data(n_workers=1, incremental=True)))
+
+    records = []
+    agg = df_daily = pyramid = None
+    for name, func in stages:
+        metrics, (agg, _) = measure(func, repeat)
+        records.append({'stage': name, 'rows_out': len(agg), **metrics})
+    df = analysis.hourly_means(agg)
+
+    downstream = [
+        ('apply_cross_channel_consistency', lambda: analysis.apply_cross_channel_consistency(df)[0]),
+        ('compute_daily_mean', lambda: analysis.compute_daily_mean(agg)),
+        ('characterize_channels', lambda: analysis.characterize_channels(df_daily, agg)),
+        ('build_pyramid', lambda: analysis.build_pyramid(agg)),
+        # Statistics over the middle half of the record, from pyramid bins
+        ('pyramid_stats', lambda: analysis.pyramid_stats(
+            agg.index[len(agg) // 4], agg.index[3 * len(agg) // 4], pyramid)),
+        ('detect_events', lambda: analysis.detect_events(df)[0]),
+        ('spectral_analysis', lambda: spectral.spectral_analysis(df, use_cache=False)['psd']),
+    ]
+    for name, func in downstream:
+        metrics, result = measure(func, repeat)
+        if name == 'compute_daily_mean':
+            df_daily = result
+        elif name == 'build_pyramid':
+            pyramid = result
+        records.append({'stage': name, 'rows_out': len(result), **metrics})
+
+    for record in records:
+        record.update(scale=scale, n_files=n_files, input_mb=input_mb)
+        print(f'  {scale:<7} {record["stage"]:<34} {record["wall_s"]:8.3f} s '
+              f'{record["peak_alloc_mb"]:9.1f} MB peak')
+    return records
+
+
+def git_revision() -> str:
+    """Return the current git commit, or 'unknown' outside a checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print per-stage wall time and peak memory ratios against a baseline."""
+    base = {(r['scale'], r['stage']): r for r in baseline['records']}
+    print(f'\nComparison against {baseline["label"]} ({baseline["git_revision"]}):')
+    print(f'  {"scale":<7} {"stage":<34} {"time":>9} {"base":>9} {"ratio":>7} {"mem ratio":>10}')
+    for r in results['records']:
+        b = base.get((r['scale'], r['stage']))
+        if b is None:
+            continue
+        ratio = r['wall_s'] / b['wall_s'] if b['wall_s'] else np.nan
+        mem_ratio = r['peak_alloc_mb'] / b['peak_alloc_mb'] if b['peak_alloc_mb'] else np.nan
+        print(f'  {r["scale"]:<7} {r["stage"]:<34} {r["wall_s"]:8.3f}s {b["wall_s"]:8.3f}s '
+              f'{ratio:6.2f}x {mem_ratio:9.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analysis.py pipeline stages')
+    parser.add_argument('--scales', nargs='+', default=['small', 'medium'], choices=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--label', default=None, help='results name (default: git revision)')
+    parser.add_argument('--baseline', type=Path, default=None, help='results JSON to compare against')
+    args = parser.parse_args()
+
+    label = args.label or git_revision()
+    records = []
+    for scale in args.scales:
+        records.extend(run_scale(scale, args.repeat, args.workers))
+
+    results = {
+        'label': label,
+        'git_revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'records': records,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f'{label}.json'
+    out_path.write_text(json.dumps(results, indent=1))
+    print(f'\nSaved: {out_path.relative_to(BENCH_DIR.parent)}')
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == '__main__':
+    main()
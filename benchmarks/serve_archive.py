@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+serve_archive.py - Local HTTP stand-in for the remote TMPSF file server
+
+Serves a directory of NetCDF files the way analysis.py --fetch expects a
+THREDDS/HTTP file server to: an HTML directory listing, keep-alive HTTP/1.1,
+ETag/Last-Modified validators and byte Range requests (with If-Range).
+Optionally publishes a <file>.sha256 checksum next to every file and cuts
+the first transfer of each file short, to exercise download resume.
+
+Usage:
+    python benchmarks/serve_archive.py DATA_DIR [--port 8000] [--checksums]
+        [--drop-after BYTES] [--bytes-per-second N]
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import re
+import threading
+import time
+from email.utils import formatdate
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+
+CHUNK_BYTES = 64 * 1024
+
+
+class ArchiveHandler(SimpleHTTPRequestHandler):
+    """Static file handler with Range support and optional .sha256 sidecars."""
+
+    protocol_version = 'HTTP/1.1'
+    checksums = False
+    drop_after = None
+    bytes_per_second = None
+    dropped = set()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.serve(head=True)
+
+    def do_GET(self):
+        self.serve(head=False)
+
+    def serve(self, head: bool):
+        name = unquote(urlsplit(self.path).path).strip('/')
+        root = Path(self.directory)
+        if name == '':
+            return self.send_listing(root, head)
+        if self.checksums and name.endswith('.nc.sha256') and (root / name[:-7]).is_file():
+            digest = hashlib.sha256((root / name[:-7]).read_bytes()).hexdigest()
+            return self.send_body(f'{digest}  {name[:-7]}\n'.encode(), 'text/plain', head)
+        path = root / name
+        if '/' in name or not path.is_file():
+            return self.send_error(404)
+        self.send_file(path, head)
+
+    def send_body(self, body: bytes, content_type: str, head: bool):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def send_listing(self, root: Path, head: bool):
+        names = sorted(p.name for p in root.glob('*.nc'))
+        if self.checksums:
+            names += [f'{n}.sha256' for n in names]
+        links = ''.join(f'<li><a href="{quote(n)}">{html.escape(n)}</a></li>\n' for n in sorted(names))
+        body = f'<html><body><h1>TMPSF</h1><ul>\n{links}</ul></body></html>\n'.encode()
+        self.send_body(body, 'text/html; charset=utf-8', head)
+
+    def send_file(self, path: Path, head: bool):
+        stat = path.stat()
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        start, end = 0, size - 1
+
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', self.headers.get('Range', ''))
+        if_range = self.headers.get('If-Range')
+        partial_ok = match and (if_range is None or if_range in (etag, formatdate(stat.st_mtime, usegmt=True)))
+        if partial_ok:
+            start = int(match.group(1) or 0)
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        self.send_response(206 if partial_ok else 200)
+        self.send_header('Content-Type', 'application/x-netcdf')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(stat.st_mtime, usegmt=True))
+        self.send_header('Accept-Ranges', 'bytes')
+        if partial_ok:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if head:
+            return
+
+        # Cut the first full transfer of each file short, once
+        limit = end - start + 1
+        with self.lock:
+            drop = self.drop_after is not None and not partial_ok and path.name not in self.dropped
+            if drop:
+                self.dropped.add(path.name)
+                limit = min(limit, self.drop_after)
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while limit > 0:
+                chunk = f.read(min(CHUNK_BYTES, limit))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                limit -= len(chunk)
+                if self.bytes_per_second:
+                    time.sleep(len(chunk) / self.bytes_per_second)
+        if drop:
+            self.close_connection = True
+
+
+def serve(directory: Path, port: int = 8000, checksums: bool = False,
+          drop_after: int | None = None, bytes_per_second: int | None = None) -> ThreadingHTTPServer:
+    """Create a server for `directory` on localhost:`port` (0 picks a free port).
+
+    Call serve_forever() on the result, e.g. in a daemon thread.
+    """
+    handler = type('Handler', (ArchiveHandler,), {
+        'checksums': checksums, 'drop_after': drop_after,
+        'bytes_per_second': bytes_per_second, 'dropped': set(),
+    })
+    return ThreadingHTTPServer(('127.0.0.1', port), partial(handler, directory=os.fspath(directory)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a TMPSF NetCDF directory over HTTP')
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--checksums', action='store_true',
+                        help='publish <file>.sha256 next to every file')
+    parser.add_argument('--drop-after', type=int, metavar='BYTES',
+                        help='cut the first transfer of each file after BYTES')
+    parser.add_argument('--bytes-per-second', type=int, metavar='N',
+                        help='throttle each transfer to N bytes/s')
+    args = parser.parse_args()
+
+    server = serve(args.directory, args.port, args.checksums, args.drop_after, args.bytes_per_second)
+    print(f'Serving {args.directory} at http://127.0.0.1:{server.server_address[1]}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
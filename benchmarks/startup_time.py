@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+startup_time.py - Import and startup cost of analysis.py as a library
+
+Times `import analysis` (and the modules built on it) in fresh interpreter
+processes, reports which heavy optional dependencies the import pulled in,
+and times importing each heavy dependency on its own, which is what the
+first stage that needs it pays. Results are written as JSON and can be
+compared against a saved baseline run.
+
+Usage:
+    python benchmarks/startup_time.py [--repeat 5] [--label NAME]
+        [--baseline benchmarks/results/BASE_startup.json]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / 'results'
+
+# Dependencies analysis.py only imports in the stages that use them
+HEAVY_MODULES = ['matplotlib', 'xarray', 'dask', 'netCDF4']
+
+# name -> statement timed in a fresh interpreter
+SCENARIOS = {
+    'python': 'pass',
+    'import numpy, pandas': 'import numpy, pandas',
+    'import analysis': 'import analysis',
+    'import spectral': 'import spectral',
+    'import matplotlib.pyplot': 'import matplotlib.pyplot',
+    'import xarray': 'import xarray',
+    'import dask.array': 'import dask.array',
+    'import netCDF4': 'import netCDF4',
+}
+
+PROBE = '''
+import sys, time
+t0 = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - t0
+import json
+print(json.dumps({{'import_s': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def run_probe(statement: str) -> dict:
+    """Run `statement` in a fresh interpreter; return its timing and loaded modules.
+
+    The process wall time (interpreter startup included) is measured from
+    here, the import time inside the child.
+    """
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, capture_output=True,
+                         text=True, check=True).stdout
+    wall = time.perf_counter() - t0
+    return {**json.loads(out.splitlines()[-1]), 'process_s': wall}
+
+
+def measure(statement: str, repeat: int) -> dict:
+    """Best-of-`repeat` import and process times for one scenario."""
+    runs = [run_probe(statement) for _ in range(repeat + 1)][1:]   # first run warms the OS cache
+    return {
+        'import_s': min(r['import_s'] for r in runs),
+        'process_s': min(r['process_s'] for r in runs),
+        'loaded': runs[-1]['loaded'],
+    }
+
+
+def git_revision() -> str:
+    """Return the current git commit, or 'unknown' outside a checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print per-scenario import time ratios against a baseline."""
+    base = {r['scenario']: r for r in baseline['records']}
+    print(f'\nComparison against {baseline["label"]} ({baseline["git_revision"]}):')
+    print(f'  {"scenario":<26} {"time":>9} {"base":>9} {"ratio":>7}')
+    for r in results['records']:
+        b = base.get(r['scenario'])
+        if b is None:
+            continue
+        ratio = r['import_s'] / b['import_s'] if b['import_s'] else float('nan')
+        print(f'  {r["scenario"]:<26} {r["import_s"]:8.3f}s {b["import_s"]:8.3f}s {ratio:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure analysis.py import/startup time')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--label', default=None, help='results name (default: git revision)')
+    parser.add_argument('--baseline', type=Path, default=None, help='results JSON to compare against')
+    args = parser.parse_args()
+
+    records = []
+    print(f'  {"scenario":<26} {"import":>9} {"process":>9}  heavy modules loaded')
+    for name, statement in SCENARIOS.items():
+        record = {'scenario': name, **measure(statement, args.repeat)}
+        records.append(record)
+        print(f'  {name:<26} {record["import_s"]:8.3f}s {record["process_s"]:8.3f}s  '
+              f'{", ".join(record["loaded"]) or "-"}')
+
+    label = args.label or git_revision()
+    results = {
+        'label': label,
+        'git_revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'records': records,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f'{label}_startup.json'
+    out_path.write_text(json.dumps(results, indent=1))
+    print(f'\nSaved: {out_path.relative_to(REPO_DIR)}')
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+synthetic_tmpsf.py - Synthetic TMPSF NetCDF generator
+
+Writes files with the same layout as the OOI RS03ASHS-MJ03B-07-TMPSFA301
+streamed tmpsf_sample files: an `obs` dimension, a `time` variable,
+`temperature01`..`temperature24` and matching `*_qartod_results` flags, with
+OOI-style deployment/time-range filenames. Used to benchmark the pipeline
+away from the JupyterHub kdata mount.
+
+Usage:
+    python benchmarks/synthetic_tmpsf.py OUT_DIR [--start 2015-01-01] [--days 60]
+        [--sample-seconds 60] [--file-days 7] [--spike-rate 1e-3] [--qc-fail-rate 5e-3]
+        [--seed 0] [--no-compress]
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+REFERENCE_DESIGNATOR = 'RS03ASHS-MJ03B-07-TMPSFA301-streamed-tmpsf_sample'
+N_CHANNELS = 24
+
+# OOI encodes time as float seconds since 1900-01-01
+TIME_UNITS = 'seconds since 1900-01-01'
+
+# M2 tidal period (hours), the dominant periodic signal in diffuse venting
+M2_PERIOD_HOURS = 12.42
+
+
+def ooi_filename(deployment: int, start: pd.Timestamp, end: pd.Timestamp) -> str:
+    """Build an OOI-style filename for a deployment and time range."""
+    fmt = '%Y%m%dT%H%M%S.%f'
+    return (f'deployment{deployment:04d}_{REFERENCE_DESIGNATOR}_'
+            f'{start.strftime(fmt)}-{end.strftime(fmt)}.nc')
+
+
+def synthetic_block(times: pd.DatetimeIndex, rng: np.random.Generator,
+                    spike_rate: float, qc_fail_rate: float,
+                    dropout_rate: float = 1e-3) -> tuple[np.ndarray, np.ndarray]:
+    """Generate temperatures and QARTOD flags for all 24 channels.
+
+    Each channel has its own baseline (2-15C), tidal amplitude and noise
+    level. Single-channel spikes, QARTOD suspect/fail flags (with implausible
+    values on failed samples) and NaN dropouts are added at the given rates.
+
+    Returns:
+        Tuple of (temperatures, QARTOD flags), each of shape (n_times, 24)
+    """
+    n_times = len(times)
+    channel_rng = np.random.default_rng(1234)  # channel properties fixed across files
+    baseline = channel_rng.uniform(2.0, 15.0, N_CHANNELS)
+    tidal_amp = channel_rng.uniform(0.05, 0.8, N_CHANNELS)
+    noise = channel_rng.uniform(0.02, 0.3, N_CHANNELS)
+
+    hours = (times.asi8 - times.asi8[0]) / 3.6e12
+    tide = np.sin(2 * np.pi * hours / M2_PERIOD_HOURS)[:, None]
+    temps = baseline + tidal_amp * tide + noise * rng.standard_normal((n_times, N_CHANNELS))
+
+    spikes = rng.random((n_times, N_CHANNELS)) < spike_rate
+    temps[spikes] += rng.uniform(12.0, 25.0, spikes.sum())
+
+    qc = np.ones((n_times, N_CHANNELS), dtype=np.uint8)
+    qc[rng.random((n_times, N_CHANNELS)) < qc_fail_rate / 2] = 3
+    failed = rng.random((n_times, N_CHANNELS)) < qc_fail_rate
+    qc[failed] = 4
+    temps[failed] = rng.uniform(90.0, 115.0, failed.sum())
+
+    temps[rng.random((n_times, N_CHANNELS)) < dropout_rate] = np.nan
+    return temps, qc
+
+
+def write_synthetic_archive(out_dir: Path, start: str = '2015-01-01', days: float = 60,
+                            sample_seconds: float = 60, file_days: float = 7,
+                            spike_rate: float = 1e-3, qc_fail_rate: float = 5e-3,
+                            overlap_minutes: float = 30, seed: int = 0,
+                            compress: bool = True) -> list[Path]:
+    """Write a synthetic TMPSF archive of consecutive NetCDF files.
+
+    Consecutive files overlap by `overlap_minutes`, as OOI files sometimes
+    do, so the pipeline's cross-file deduplication is exercised.
+
+    Args:
+        out_dir: Directory to write into (created if needed)
+        start: First timestamp of the archive
+        days: Total length of the archive in days
+        sample_seconds: Sampling interval in seconds
+        file_days: Length of each file in days
+        spike_rate: Fraction of values with a single-channel spike
+        qc_fail_rate: Fraction of values flagged QARTOD fail (half as many suspect)
+        overlap_minutes: Overlap between consecutive files
+        seed: Random seed
+        compress: zlib-compress variables in chunked HDF5 storage, like OOI files
+
+    Returns:
+        List of written file paths
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start)
+    end = start + pd.Timedelta(days=days)
+    step = pd.Timedelta(seconds=sample_seconds)
+
+    paths = []
+    file_start = start
+    while file_start < end:
+        file_end = min(file_start + pd.Timedelta(days=file_days), end)
+        times = pd.date_range(file_start, file_end + pd.Timedelta(minutes=overlap_minutes),
+                              freq=step, inclusive='left')
+        temps, qc = synthetic_block(times, rng, spike_rate, qc_fail_rate)
+
+        ds = xr.Dataset(coords={'obs': np.arange(len(times), dtype=np.int32)})
+        ds['time'] = ('obs', times.values)
+        for j in range(N_CHANNELS):
+            var = f'temperature{j + 1:02d}'
+            ds[var] = ('obs', temps[:, j], {'units': 'ºC', 'long_name': f'Temperature {j + 1:02d}'})
+            ds[f'{var}_qartod_results'] = ('obs', qc[:, j])
+        ds = ds.set_coords('time')
+
+        encoding = {var: {'zlib': True, 'complevel': 4} for var in ds.data_vars} if compress else {}
+        encoding['time'] = {'units': TIME_UNITS, 'dtype': 'float64'}
+        path = out_dir / ooi_filename(1, times[0], times[-1])
+        ds.to_netcdf(path, encoding=encoding)
+        paths.append(path)
+        file_start = file_end
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic TMPSF NetCDF archive')
+    parser.add_argument('out_dir', type=Path)
+    parser.add_argument('--start', default='2015-01-01')
+    parser.add_argument('--days', type=float, default=60)
+    parser.add_argument('--sample-seconds', type=float, default=60)
+    parser.add_argument('--file-days', type=float, default=7)
+    parser.add_argument('--spike-rate', type=float, default=1e-3)
+    parser.add_argument('--qc-fail-rate', type=float, default=5e-3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-compress', action='store_true')
+    args = parser.parse_args()
+
+    paths = write_synthetic_archive(
+        args.out_dir, start=args.start, days=args.days, sample_seconds=args.sample_seconds,
+        file_days=args.file_days, spike_rate=args.spike_rate,
+        qc_fail_rate=args.qc_fail_rate, seed=args.seed, compress=not args.no_compress,
+    )
+    print(f'Wrote {len(paths)} files to {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+fetch.py - Incremental mirror of a remote TMPSF NetCDF archive
+
+Lists an HTTP directory index (THREDDS fileServer or any web server) and
+downloads the .nc files that are missing locally or changed remotely over a
+small pool of keep-alive connections, resuming partial transfers and
+checking sizes and published .sha256 checksums. Used by
+`analysis.py --fetch URL`, which starts ingesting files while the rest are
+still downloading.
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
+
+import pandas as pd
+
+# Remote archive fetch (--fetch URL): pooled connections, download chunk size,
+# attempts per file (resuming partial downloads) and the per-directory
+# manifest of fetched files
+FETCH_MAX_CONNECTIONS = 4
+FETCH_CHUNK_BYTES = 1 << 20
+FETCH_RETRIES = 3
+FETCH_TIMEOUT_S = 60
+FETCH_MANIFEST_NAME = '.fetch_manifest.json'
+
+# Time range in OOI filenames (..._20150101T000000.000000-20150110T000000.000000.nc)
+OOI_FILENAME_RANGE = re.compile(r'_(\d{8}T\d{6})(?:\.\d+)?-(\d{8}T\d{6})(?:\.\d+)?\.nc$')
+
+def remote_file_window(name: str) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+    """Time range encoded in an OOI filename (..._<start>-<end>.nc), if any."""
+    match = OOI_FILENAME_RANGE.search(name)
+    if match is None:
+        return None
+    return pd.Timestamp(match.group(1)), pd.Timestamp(match.group(2))
+
+
+def open_connection_pool(base_url: str, size: int) -> asyncio.Queue:
+    """Queue of `size` keep-alive HTTP(S) connections to the host of `base_url`.
+
+    Connections are opened lazily by http.client on first use and reused for
+    every request, so at most `size` are ever open to the server.
+    """
+    parts = urlsplit(base_url)
+    connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                        else http.client.HTTPConnection)
+    pool = asyncio.Queue()
+    for _ in range(size):
+        pool.put_nowait(connection_class(parts.netloc, timeout=FETCH_TIMEOUT_S))
+    return pool
+
+
+@asynccontextmanager
+async def pooled_connection(pool: asyncio.Queue):
+    """Borrow a connection from the pool, waiting while all are in use."""
+    conn = await pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put_nowait(conn)
+
+
+def http_request(conn: http.client.HTTPConnection, method: str, url: str,
+                 headers: dict | None = None) -> http.client.HTTPResponse:
+    """Send a request on a pooled connection, reconnecting once if it was dropped."""
+    target = urlsplit(url)._replace(scheme='', netloc='').geturl()
+    for attempt in range(2):
+        try:
+            conn.request(method, target, headers=headers or {})
+            return conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest):
+            conn.close()
+            if attempt:
+                raise
+
+
+def read_text(conn: http.client.HTTPConnection, url: str) -> str:
+    """GET a small text resource (directory listing, checksum file)."""
+    response = http_request(conn, 'GET', url)
+    body = response.read()
+    if response.status != 200:
+        raise OSError(f'GET {url}: HTTP {response.status}')
+    return body.decode('utf-8', errors='replace')
+
+
+def list_remote_files(conn: http.client.HTTPConnection, base_url: str) -> tuple[dict, dict]:
+    """List .nc files and .sha256 checksum files in an HTTP directory index.
+
+    Works with THREDDS fileServer-style and plain web server listings: every
+    link ending in .nc (or .nc.sha256) is taken, relative to `base_url`.
+
+    Returns:
+        Tuple of ({filename: url} for NetCDF files, {filename: url} of their
+        checksum files)
+    """
+    files, checksums = {}, {}
+    for href in re.findall(r'href=["\']([^"\'?#]+)["\']', read_text(conn, base_url)):
+        url = urljoin(base_url, href)
+        name = unquote(Path(urlsplit(url).path).name)
+        if name.endswith('.nc'):
+            files[name] = url
+        elif name.endswith('.nc.sha256'):
+            checksums[name[:-len('.sha256')]] = url
+    return files, checksums
+
+
+def remote_metadata(response: http.client.HTTPResponse) -> dict:
+    """Size and validators of a remote file from its response headers."""
+    content_range = response.getheader('Content-Range')
+    size = (int(content_range.rsplit('/', 1)[1]) if content_range
+            else int(response.getheader('Content-Length', -1)))
+    return {'size': size, 'etag': response.getheader('ETag'),
+            'last_modified': response.getheader('Last-Modified')}
+
+
+def head_remote_file(conn: http.client.HTTPConnection, url: str) -> dict:
+    """HEAD a remote file for its size, ETag and Last-Modified."""
+    response = http_request(conn, 'HEAD', url)
+    response.read()
+    if response.status != 200:
+        raise OSError(f'HEAD {url}: HTTP {response.status}')
+    return remote_metadata(response)
+
+
+def file_sha256(path: Path) -> 'hashlib._Hash':
+    """Running sha256 of a file's current contents (read in FETCH_CHUNK_BYTES)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(FETCH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest
+
+
+def download_file(conn: http.client.HTTPConnection, url: str, dest: Path,
+                  remote: dict, expected_sha256: str | None = None) -> dict:
+    """Download `url` to `dest`, resuming a partial `<dest>.part` if present.
+
+    A partial download is continued with a Range request guarded by If-Range,
+    so it restarts from scratch if the remote file changed meanwhile (or if
+    the server rejects the range because the partial file is too long). The
+    finished file must match the remote size and, when the server publishes
+    one, its .sha256 checksum before it replaces `dest`.
+
+    Returns:
+        Manifest entry: size, etag, last_modified and sha256
+    """
+    part = dest.with_name(dest.name + '.part')
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {}
+    if 0 < offset:
+        headers['Range'] = f'bytes={offset}-'
+        if remote['etag'] or remote['last_modified']:
+            headers['If-Range'] = remote['etag'] or remote['last_modified']
+
+    response = http_request(conn, 'GET', url, headers)
+    if response.status == 416 and offset != remote['size']:
+        # .part is longer than the remote file (changed without validators,
+        # or corrupt): discard it and download from byte 0
+        response.read()
+        part.unlink()
+        return download_file(conn, url, dest, remote, expected_sha256)
+    if response.status == 416:
+        response.read()                 # .part is already complete
+        digest = file_sha256(part)
+    elif response.status in (200, 206):
+        remote = remote_metadata(response) if response.status == 200 else remote
+        resume = response.status == 206
+        digest = file_sha256(part) if resume else hashlib.sha256()
+        with open(part, 'ab' if resume else 'wb') as f:
+            while chunk := response.read(FETCH_CHUNK_BYTES):
+                f.write(chunk)
+                digest.update(chunk)
+    else:
+        response.read()
+        raise OSError(f'GET {url}: HTTP {response.status}')
+
+    size = part.stat().st_size
+    if remote['size'] >= 0 and size != remote['size']:
+        raise OSError(f'{dest.name}: got {size} of {remote["size"]} bytes')
+    if expected_sha256 and digest.hexdigest() != expected_sha256:
+        part.unlink()
+        raise ValueError(f'{dest.name}: sha256 mismatch, partial download discarded')
+    os.replace(part, dest)
+    return {**remote, 'size': size, 'sha256': digest.hexdigest()}
+
+
+async def fetch_archive(base_url: str, dest_dir: Path, window: tuple | None = None,
+                        max_connections: int | None = None):
+    """Mirror the remote TMPSF file listing into `dest_dir`, yielding ready files.
+
+    Only files that are missing locally or changed remotely (by size, ETag or
+    Last-Modified, compared with the manifest of earlier fetches) are
+    downloaded, over at most `max_connections` pooled connections. Files
+    whose OOI filename time range lies outside `window` are skipped. Failed
+    transfers are retried from where they stopped.
+
+    Args:
+        base_url: URL of the remote directory listing
+        dest_dir: Local directory
+        window: Inclusive (start, end) timestamps, e.g. analysis.time_window()
+            (default: every file)
+        max_connections: Connection pool size (defaults to FETCH_MAX_CONNECTIONS)
+
+    Yields:
+        Tuple of (local path of a file that is now up to date, set of names
+        still downloading); files that were already current come first, then
+        downloads in completion order
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    base_url = base_url if base_url.endswith('/') else base_url + '/'
+    pool = open_connection_pool(base_url, max_connections or FETCH_MAX_CONNECTIONS)
+    manifest_path = dest_dir / FETCH_MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    tasks = []
+    try:
+        async with pooled_connection(pool) as conn:
+            files, checksums = await asyncio.to_thread(list_remote_files, conn, base_url)
+        files = {name: url for name, url in sorted(files.items())
+                 if window is None or (w := remote_file_window(name)) is None
+                 or (w[0] <= window[1] and w[1] >= window[0])}
+
+        async def head(url):
+            async with pooled_connection(pool) as conn:
+                return await asyncio.to_thread(head_remote_file, conn, url)
+
+        remotes = dict(zip(files, await asyncio.gather(*(head(url) for url in files.values()))))
+        current, stale = [], []
+        for name, remote in remotes.items():
+            local, entry = dest_dir / name, manifest.get(name)
+            if local.exists() and local.stat().st_size == remote['size'] and (
+                    entry is None or all(entry[k] == remote[k] for k in ('size', 'etag', 'last_modified'))):
+                manifest.setdefault(name, {**remote, 'sha256': None})
+                current.append(name)
+            else:
+                stale.append(name)
+        print(f'Fetch: {len(current)} of {len(files)} remote files up to date, '
+              f'downloading {len(stale)}')
+        downloading = set(stale)
+        for name in current:
+            yield dest_dir / name, downloading
+
+        async def fetch(name):
+            url, dest = files[name], dest_dir / name
+            for attempt in range(FETCH_RETRIES):
+                try:
+                    async with pooled_connection(pool) as conn:
+                        expected = (await asyncio.to_thread(read_text, conn, checksums[name])).split()[0] \
+                            if name in checksums else None
+                        entry = await asyncio.to_thread(download_file, conn, url, dest,
+                                                        remotes[name], expected)
+                    return name, entry
+                except (OSError, http.client.HTTPException) as exc:
+                    if attempt == FETCH_RETRIES - 1:
+                        raise
+                    print(f'  {exc}; retrying')
+
+        n_bytes, t_start = 0, time.perf_counter()
+        # Tasks queue for connections in filename order, so downloads (and the
+        # ingest waiting on them) progress from the oldest file
+        tasks = [asyncio.ensure_future(fetch(name)) for name in stale]
+        for task in asyncio.as_completed(tasks):
+            name, manifest[name] = await task
+            n_bytes += manifest[name]['size']
+            manifest_path.write_text(json.dumps(manifest, indent=1))
+            downloading.discard(name)
+            yield dest_dir / name, downloading
+
+        if stale:
+            elapsed = time.perf_counter() - t_start
+            print(f'  Downloaded {len(stale)} files, {n_bytes / 2**20:.1f} MB in {elapsed:.1f} s')
+    finally:
+        # A failed download (or a consumer that stops early) must not leave
+        # other transfers running or connections open
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)   # returns their connections
+        while not pool.empty():
+            pool.get_nowait().close()
+
+
+def fetch_data(base_url: str, dest_dir: Path, window: tuple | None = None,
+               max_connections: int | None = None) -> list[Path]:
+    """Run fetch_archive() to completion.
+
+    Returns:
+        Local paths of all remote files in the time window
+    """
+    async def collect():
+        return [path async for path, _ in fetch_archive(base_url, dest_dir, window, max_connections)]
+    return asyncio.run(collect())
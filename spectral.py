@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+spectral.py - Spectral and cross-channel analysis of TMPSF hourly data
+
+Gap-aware Welch power spectral densities, the full 24x24 magnitude-squared
+coherence matrix and lagged cross-correlations for the QC'd hourly frame from
+analysis.py, each computed for all channels (or channel pairs) with batched
+numpy FFT calls. Results are cached as .npz files keyed by the input data and
+parameters.
+
+Usage:
+    python spectral.py [HOURLY_PARQUET]
+"""
+
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analysis
+from analysis import TEMP_VARS
+
+# Welch segments: 30 days resolves M2 (12.42 h) from S2 (12 h); 50% overlap,
+# Hann window
+SPECTRAL_SEGMENT_HOURS = 24 * 30
+SPECTRAL_OVERLAP = 0.5
+
+# A segment is used for a channel only if at least this fraction of its
+# hours are valid; the remaining gaps are zero-filled after removing the mean
+SPECTRAL_MIN_VALID = 0.8
+
+# Cross-correlation lags (hours) on either side of zero
+SPECTRAL_MAX_LAG_HOURS = 72
+
+# Cached results, one .npz per input/parameter combination (None: the
+# 'spectral' directory under analysis.DATA_OUTPUT_DIR at call time, so
+# pipeline_settings(output_dir=...) applies)
+SPECTRAL_CACHE_DIR = None
+
+# Hourly data: frequencies are reported in cycles per day
+SAMPLES_PER_DAY = 24
+
+
+def hourly_values(df: pd.DataFrame, channels: list[str] | None = None) -> np.ndarray:
+    """Return the channels of `df` on a regular hourly grid as a float64 array.
+
+    Missing hours (and NaN values) stay NaN, so gaps are handled downstream.
+    """
+    channels = channels or [c for c in TEMP_VARS if c in df.columns]
+    return df[channels].asfreq('h').to_numpy(dtype=np.float64)
+
+
+def segment_spectra(values: np.ndarray, nperseg: int, overlap: float = SPECTRAL_OVERLAP,
+                    min_valid: float = SPECTRAL_MIN_VALID) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Windowed FFTs of every Welch segment of every channel in one call.
+
+    Each segment is demeaned over its valid hours, gaps are zero-filled and
+    a Hann window applied. Per-segment scale factors normalize by the
+    window energy over the valid hours only, so partial segments are not
+    biased low.
+
+    Args:
+        values: Array (n_hours, n_channels) with NaN gaps
+        nperseg: Segment length in hours
+        overlap: Fractional overlap between consecutive segments
+        min_valid: Minimum fraction of valid hours for a segment to be used
+
+    Returns:
+        Tuple of (spectra (n_seg, n_freq, n_channels) complex, usable
+        (n_seg, n_channels) bool, scale (n_seg, n_channels))
+    """
+    step = max(1, int(round(nperseg * (1 - overlap))))
+    segments = np.lib.stride_tricks.sliding_window_view(values, nperseg, axis=0)[::step]
+    segments = segments.transpose(0, 2, 1)                     # (n_seg, nperseg, n_channels)
+    valid = ~np.isnan(segments)
+    n_valid = valid.sum(axis=1)
+    usable = n_valid >= min_valid * nperseg
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nansum(segments, axis=1) / n_valid
+    window = np.hanning(nperseg)
+    filled = np.where(valid, segments - means[:, None, :], 0.0) * window[None, :, None]
+    spectra = np.fft.rfft(filled, axis=1)
+
+    energy = np.einsum('t,stc->sc', window**2, valid)
+    with np.errstate(divide='ignore'):
+        scale = np.where(usable, 1.0 / (SAMPLES_PER_DAY * energy), 0.0)
+    return spectra, usable, scale
+
+
+def one_sided(psd: np.ndarray, nperseg: int) -> np.ndarray:
+    """Double the non-DC (and non-Nyquist) bins of a two-sided spectrum."""
+    psd = psd.copy()
+    psd[1:-1 if nperseg % 2 == 0 else None] *= 2
+    return psd
+
+
+def welch_psd(spectra: np.ndarray, usable: np.ndarray, scale: np.ndarray,
+              nperseg: int) -> np.ndarray:
+    """Average segment periodograms per channel (degC^2 per cycle/day).
+
+    Returns:
+        Array (n_freq, n_channels); NaN for channels without usable segments
+    """
+    power = (np.abs(spectra)**2 * scale[:, None, :]).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        psd = power / usable.sum(axis=0)
+    return one_sided(psd, nperseg)
+
+
+def coherence_matrix(spectra: np.ndarray, usable: np.ndarray,
+                     scale: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Magnitude-squared coherence and phase for every channel pair.
+
+    Cross and auto spectra of a pair are averaged over the segments usable
+    for both channels, so each pair's coherence is bounded by 1 even when
+    channels have different gaps.
+
+    Returns:
+        Tuple of (coherence (n_freq, n_ch, n_ch), phase in radians
+        (n_freq, n_ch, n_ch), segments used per pair (n_ch, n_ch))
+    """
+    weights = np.sqrt(scale) * usable
+    weighted = spectra * weights[:, None, :]
+    cross = np.einsum('sfi,sfj->fij', weighted, weighted.conj())
+    auto = np.einsum('sfi,sj->fij', np.abs(weighted)**2, usable.astype(np.float64))
+    n_common = usable.T.astype(np.int64) @ usable.astype(np.int64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        coherence = np.abs(cross)**2 / (auto * auto.transpose(0, 2, 1))
+    coherence[:, n_common == 0] = np.nan
+    return np.clip(coherence, 0, 1), np.angle(cross), n_common
+
+
+def lagged_sums(a: np.ndarray, b: np.ndarray, max_lag: int, n_fft: int) -> np.ndarray:
+    """sum_t a[t, i] * b[t + lag, j] for lags -max_lag..max_lag via FFT.
+
+    Returns:
+        Array (n_channels, n_channels, 2 * max_lag + 1)
+    """
+    fa = np.fft.rfft(a, n_fft, axis=0)
+    fb = np.fft.rfft(b, n_fft, axis=0)
+    out = np.empty((a.shape[1], b.shape[1], 2 * max_lag + 1))
+    for i in range(a.shape[1]):
+        corr = np.fft.irfft(fa[:, i, None].conj() * fb, n_fft, axis=0)
+        out[i] = np.concatenate([corr[n_fft - max_lag:], corr[:max_lag + 1]]).T
+    return out
+
+
+def cross_correlation(values: np.ndarray, max_lag: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pearson correlation of every channel pair at each lag, skipping gaps.
+
+    xcorr[i, j, k] correlates channel i at time t with channel j at time
+    t + lags[k] over the hours where both are valid, so positive lags mean
+    j follows i. The sums for all pairs and lags come from six batched FFT
+    cross-correlations of the values, their squares and the validity masks.
+
+    Returns:
+        Tuple of (lags in hours, xcorr (n_ch, n_ch, n_lags), overlapping
+        hours per pair and lag (n_ch, n_ch, n_lags))
+    """
+    valid = ~np.isnan(values)
+    x = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+    v = valid.astype(np.float64)
+    n_fft = 1 << int(np.ceil(np.log2(len(values) + max_lag)))
+
+    n = np.rint(lagged_sums(v, v, max_lag, n_fft))
+    sx = lagged_sums(x, v, max_lag, n_fft)
+    sy = lagged_sums(v, x, max_lag, n_fft)
+    sxx = lagged_sums(x**2, v, max_lag, n_fft)
+    syy = lagged_sums(v, x**2, max_lag, n_fft)
+    sxy = lagged_sums(x, x, max_lag, n_fft)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        var = (sxx - sx**2 / n) * (syy - sy**2 / n)
+        xcorr = np.where(n > 2, cov / np.sqrt(np.clip(var, 0, None)), np.nan)
+    return np.arange(-max_lag, max_lag + 1), np.clip(xcorr, -1, 1), n.astype(np.int64)
+
+
+def spectral_cache_key(df: pd.DataFrame, params: dict) -> str:
+    """Hash of the frame's index, columns and values plus the parameters."""
+    h = hashlib.sha256()
+    h.update(json.dumps(params, sort_keys=True).encode())
+    h.update(json.dumps(list(map(str, df.columns))).encode())
+    h.update(np.ascontiguousarray(df.index.asi8).tobytes())
+    h.update(np.ascontiguousarray(df.to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def spectral_analysis(df: pd.DataFrame, segment_hours: int | None = None,
+                      max_lag_hours: int | None = None, cache_dir: Path | None = None,
+                      use_cache: bool = True) -> dict[str, np.ndarray]:
+    """PSDs, coherence and cross-correlation for all channels of an hourly frame.
+
+    Args:
+        df: QC'd hourly frame (e.g. from apply_cross_channel_consistency())
+        segment_hours: Welch segment length (defaults to SPECTRAL_SEGMENT_HOURS)
+        max_lag_hours: Largest cross-correlation lag (defaults to SPECTRAL_MAX_LAG_HOURS)
+        cache_dir: Where results are cached (defaults to SPECTRAL_CACHE_DIR,
+            or analysis.DATA_OUTPUT_DIR / 'spectral')
+        use_cache: Read and write the .npz cache
+
+    Returns:
+        Dict of arrays: channels, freq (cycles/day), psd (n_freq, n_ch),
+        n_segments (n_ch), coherence and phase (n_freq, n_ch, n_ch),
+        n_common_segments (n_ch, n_ch), lags (hours), xcorr and xcorr_n
+        (n_ch, n_ch, n_lags)
+    """
+    channels = [c for c in TEMP_VARS if c in df.columns]
+    nperseg = segment_hours or SPECTRAL_SEGMENT_HOURS
+    max_lag = SPECTRAL_MAX_LAG_HOURS if max_lag_hours is None else max_lag_hours
+    params = {'segment_hours': nperseg, 'overlap': SPECTRAL_OVERLAP,
+              'min_valid': SPECTRAL_MIN_VALID, 'max_lag_hours': max_lag}
+
+    df = df[channels].asfreq('h')
+    cache_dir = cache_dir or SPECTRAL_CACHE_DIR or analysis.DATA_OUTPUT_DIR / 'spectral'
+    cache_path = cache_dir / f'{spectral_cache_key(df, params)[:32]}.npz'
+    if use_cache and cache_path.exists():
+        with np.load(cache_path) as cached:
+            return dict(cached)
+
+    values = hourly_values(df, channels)
+    if len(values) < nperseg:
+        raise ValueError(f'{len(values)} hours of data is shorter than one '
+                         f'{nperseg}-hour segment')
+    t_start = time.perf_counter()
+    spectra, usable, scale = segment_spectra(values, nperseg)
+    coherence, phase, n_common = coherence_matrix(spectra, usable, scale)
+    lags, xcorr, xcorr_n = cross_correlation(values, max_lag)
+    results = {
+        'channels': np.array(channels),
+        'freq': np.fft.rfftfreq(nperseg, d=1 / SAMPLES_PER_DAY),
+        'psd': welch_psd(spectra, usable, scale, nperseg),
+        'n_segments': usable.sum(axis=0),
+        'coherence': coherence,
+        'phase': phase,
+        'n_common_segments': n_common,
+        'lags': lags,
+        'xcorr': xcorr,
+        'xcorr_n': xcorr_n,
+    }
+    print(f'  Spectral analysis: {len(channels)} channels, {len(spectra)} segments, '
+          f'{time.perf_counter() - t_start:.2f} s')
+
+    if use_cache:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(cache_path, **results)
+    return results
+
+
+if __name__ == '__main__':
+    path = (Path(sys.argv[1]) if len(sys.argv) > 1 else
+            analysis.DATA_OUTPUT_DIR / f'tmpsf_{analysis.get_date_range_str()}_hourly.parquet')
+    results = spectral_analysis(pd.read_parquet(path))
+    m2 = np.argmin(np.abs(results['freq'] - 24 / 12.42))
+    print(f'  M2 ({results["freq"][m2]:.3f} cpd) power by channel:')
+    for channel, power in zip(results['channels'], results['psd'][m2]):
+        print(f'    {channel}: {power:.4g} degC^2/cpd')